@@ -37,7 +37,8 @@ def main():
     print("This will open your browser for GitHub OAuth...")
     
     try:
-        authenticated = chat.authenticate()
+        # The workspace used in step 3 is analyzed while the login waits
+        authenticated = chat.authenticate(workspace=str(Path.cwd()))
         
         if not authenticated:
             print("\n❌ Authentication failed!")
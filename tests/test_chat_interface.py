@@ -0,0 +1,275 @@
+"""
+Tests for the GitHub Copilot chat interface
+"""
+
+import io
+import json
+import os
+import socket
+import stat
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import pytest
+import requests
+import urllib3
+
+# Add the package to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from vscodey.copilot import chat_interface
+from vscodey.copilot.chat_interface import (
+    RETRY_AFTER_MAX,
+    ChatInterface,
+    CopilotTokenManager,
+    GitHubCopilotAPIClient,
+    WorkspaceContextManager,
+)
+from vscodey.copilot.config import CLIConfig
+
+
+class FakeTokenResponse:
+    """Successful response from the Copilot token endpoint."""
+
+    status_code = 200
+
+    def __init__(self, token):
+        self.token = token
+
+    def json(self):
+        return {"token": self.token, "expires_in": 3600}
+
+
+class FakeTokenSession:
+    """Session that hands out numbered Copilot tokens and counts exchanges."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def post(self, url, **kwargs):
+        self.calls += 1
+        return FakeTokenResponse(f"copilot-{self.calls}")
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """Path of a Copilot token cache inside a temporary directory."""
+    return tmp_path / "copilot_token.json"
+
+
+def test_token_cache_round_trip(cache_path):
+    """Test that a new manager reuses the cached token without another exchange."""
+    first = CopilotTokenManager(cache_path=cache_path, session=FakeTokenSession())
+    assert first.get_copilot_token("gho_alice") == "copilot-1"
+    if os.name == "posix":
+        assert stat.S_IMODE(cache_path.stat().st_mode) == 0o600
+    assert "gho_alice" not in cache_path.read_text()
+
+    session = FakeTokenSession()
+    second = CopilotTokenManager(cache_path=cache_path, session=session)
+    assert second.get_copilot_token("gho_alice") == "copilot-1"
+    assert session.calls == 0
+
+
+def test_token_cache_ignores_other_identity(cache_path):
+    """Test that a token cached for one GitHub token is not handed to another."""
+    CopilotTokenManager(
+        cache_path=cache_path, session=FakeTokenSession()
+    ).get_copilot_token("gho_alice")
+
+    session = FakeTokenSession()
+    manager = CopilotTokenManager(cache_path=cache_path, session=session)
+    assert manager.get_copilot_token("gho_bob") == "copilot-1"
+    assert session.calls == 1
+
+
+def test_invalidate_removes_cache(cache_path):
+    """Test that invalidate() forgets the token and deletes the cache file."""
+    manager = CopilotTokenManager(cache_path=cache_path, session=FakeTokenSession())
+    manager.get_copilot_token("gho_alice")
+
+    manager.invalidate()
+
+    assert manager.copilot_token is None
+    assert not cache_path.exists()
+
+
+def make_sse_response(frames):
+    """Build a streamed text/event-stream response without a charset."""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "text/event-stream"
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.raw = io.BytesIO("\n\n".join(frames).encode("utf-8"))
+    return response
+
+
+def delta(content):
+    """Format one chat completion chunk as an SSE data line."""
+    return "data: " + json.dumps(
+        {"choices": [{"delta": {"content": content}}]}, ensure_ascii=False
+    )
+
+
+def test_stream_yields_utf8_deltas():
+    """Test that streamed deltas are decoded as UTF-8 and [DONE] ends the stream."""
+    response = make_sse_response([
+        ": keep-alive",
+        delta("héllo ✓"),
+        "data: {not json",
+        'data: {"choices": [{"delta": {}}]}',
+        delta(" world"),
+        "data: [DONE]",
+        delta("ignored"),
+    ])
+    client = GitHubCopilotAPIClient("copilot-token")
+
+    assert list(client._iter_stream_content(response)) == ["héllo ✓", " world"]
+
+
+class FakeStreamingClient:
+    """API client whose streaming call yields fixed chunks."""
+
+    def send_chat_request_stream(self, **kwargs):
+        return {"success": True, "stream": iter(["Hel", "lo"]), "model": "gpt-4o-mini"}
+
+
+def test_send_message_streams_to_callback(tmp_path):
+    """Test that send_message passes chunks to on_content and returns the full text."""
+    chat = ChatInterface(CLIConfig(str(tmp_path / "config.json")))
+    chat.api_client = FakeStreamingClient()
+    chunks = []
+
+    response = chat.send_message("hi", context={}, on_content=chunks.append)
+
+    assert chunks == ["Hel", "lo"]
+    assert response["content"] == "Hello"
+
+
+def test_timed_out_post_is_not_retried():
+    """Test that a read timeout surfaces as Timeout after a single POST."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    accepted = []
+
+    def accept_and_hang():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            accepted.append(conn)
+
+    threading.Thread(target=accept_and_hang, daemon=True).start()
+    client = GitHubCopilotAPIClient("copilot-token")
+    url = "http://127.0.0.1:%d/chat/completions" % server.getsockname()[1]
+    try:
+        with pytest.raises(requests.exceptions.Timeout):
+            client.session.post(url, data=b"{}", timeout=0.2)
+    finally:
+        server.close()
+        for conn in accepted:
+            conn.close()
+
+    assert len(accepted) == 1
+
+
+def test_retry_after_wait_is_capped():
+    """Test that a huge Retry-After header doesn't stall the client for that long."""
+    retry = GitHubCopilotAPIClient("copilot-token").session.get_adapter(
+        "https://"
+    ).max_retries
+    response = urllib3.HTTPResponse(headers={"Retry-After": "3600"}, status=429)
+
+    assert retry.get_retry_after(response) == RETRY_AFTER_MAX
+
+
+def finished_future(result=None, error=None):
+    """Future that has already completed with a result or an error."""
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+def test_prefetched_context_is_used_once(tmp_path):
+    """Test that the first request for the prefetched workspace gets its context."""
+    chat = ChatInterface(CLIConfig(str(tmp_path / "config.json")))
+    workspace = str(tmp_path)
+    chat._workspace_prefetch = (workspace, finished_future({"path": "prefetched"}))
+
+    request = chat._prepare_request("hi", {"workspace": workspace})
+
+    assert request["workspace_context"] == {"path": "prefetched"}
+    assert chat._workspace_prefetch is None
+
+
+def test_prefetch_for_other_workspace_is_discarded(tmp_path):
+    """Test that a prefetch for a different path is dropped, not kept forever."""
+    chat = ChatInterface(CLIConfig(str(tmp_path / "config.json")))
+    chat._workspace_prefetch = ("/elsewhere", finished_future({"path": "/elsewhere"}))
+
+    request = chat._prepare_request("hi", {"workspace": str(tmp_path)})
+
+    assert request["workspace_context"]["path"] == str(tmp_path)
+    assert chat._workspace_prefetch is None
+
+
+def test_failed_prefetch_falls_back_to_scan(tmp_path):
+    """Test that a prefetch error is not raised and the workspace is scanned instead."""
+    chat = ChatInterface(CLIConfig(str(tmp_path / "config.json")))
+    workspace = str(tmp_path)
+    chat._workspace_prefetch = (workspace, finished_future(error=OSError("boom")))
+
+    request = chat._prepare_request("hi", {"workspace": workspace})
+
+    assert request["workspace_context"]["path"] == workspace
+
+
+@pytest.fixture
+def ws_cache(monkeypatch):
+    """Empty workspace context cache for the duration of a test."""
+    cache = OrderedDict()
+    monkeypatch.setattr(chat_interface, "_WS_CACHE", cache)
+    return cache
+
+
+def test_workspace_context_cache_returns_copies(tmp_path, ws_cache, monkeypatch):
+    """Test that cached contexts are reused but callers cannot mutate the cache."""
+    manager = WorkspaceContextManager(tmp_path)
+    first = manager.get_workspace_context()
+    first["project_info"]["type"] = "mutated"
+
+    monkeypatch.setattr(manager, "_get_project_info", lambda: pytest.fail("rescanned"))
+    second = manager.get_workspace_context()
+
+    assert second["project_info"]["type"] == "unknown"
+
+
+def test_workspace_context_cache_expires(tmp_path, ws_cache, monkeypatch):
+    """Test that entries are rebuilt after the TTL even if no mtime changed."""
+    monkeypatch.setattr(chat_interface, "_WS_CACHE_TTL", 0)
+    manager = WorkspaceContextManager(tmp_path)
+    manager.get_workspace_context()
+    calls = []
+    monkeypatch.setattr(manager, "_get_project_info", lambda: calls.append(1) or {})
+
+    manager.get_workspace_context()
+
+    assert calls == [1]
+
+
+def test_workspace_context_cache_is_bounded(tmp_path, ws_cache, monkeypatch):
+    """Test that the least recently used workspaces are evicted."""
+    monkeypatch.setattr(chat_interface, "_WS_CACHE_SIZE", 2)
+    paths = [tmp_path / name for name in ("a", "b", "c")]
+    for path in paths:
+        path.mkdir()
+        WorkspaceContextManager(path).get_workspace_context()
+
+    assert list(ws_cache) == [str(paths[1]), str(paths[2])]
@@ -0,0 +1,118 @@
+"""
+Tests for the simulated chat interface's file analysis
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add the package to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from vscodey.copilot import chat_interface_old
+from vscodey.copilot.chat_interface_old import ChatInterface
+from vscodey.copilot.config import CLIConfig
+
+requires_ijson = pytest.mark.skipif(
+    chat_interface_old.ijson is None, reason="ijson is not installed"
+)
+
+
+JSON_DOCUMENTS = [
+    '{}',
+    '[]',
+    '{"a": 1, "b": [1, 2, {"c": null}], "d": {"e": {"f": "g"}}}',
+    '[1, "two", [3, [4, []]], {"k": {}}, true]',
+    '{"k1": 1, "k2": 2, "k3": 3, "k4": 4, "k5": 5, "k6": [6, 7]}',
+    '  \n[{"id": 1, "tags": ["x", "y"]}, {"id": 2, "tags": []}]',
+]
+
+
+@requires_ijson
+@pytest.mark.parametrize("content", JSON_DOCUMENTS)
+def test_stream_json_summary_matches_tree(content):
+    """Test that the ijson summary matches the one built from the parsed tree."""
+    expected = ChatInterface._summarize_json(json.loads(content))
+
+    assert chat_interface_old._stream_json_summary(content) == expected
+
+
+@requires_ijson
+def test_analyze_json_content_same_with_streaming(monkeypatch):
+    """Test that streaming large JSON files doesn't change the rendered analysis."""
+    chat = ChatInterface.__new__(ChatInterface)
+    content = json.dumps({"items": [{"id": i, "tags": ["a", "b"]} for i in range(50)]})
+    lines = content.split("\n")
+
+    monkeypatch.setattr(chat_interface_old, "_JSON_STREAM_THRESHOLD", 0)
+    # Whichever backend is installed, exercise the streaming path
+    monkeypatch.setattr(
+        chat_interface_old, "_IJSON_C_BACKENDS", {chat_interface_old.ijson.backend}
+    )
+    assert chat_interface_old._can_stream_json(content)
+    streamed = chat._analyze_json_content(content, lines, "data.json")
+
+    monkeypatch.setattr(chat_interface_old, "ijson", None)
+    assert not chat_interface_old._can_stream_json(content)
+    parsed = chat._analyze_json_content(content, lines, "data.json")
+
+    assert streamed == parsed
+
+
+@requires_ijson
+def test_pure_python_ijson_backend_not_streamed(monkeypatch):
+    """Test that large JSON is parsed normally when ijson only has its Python backend."""
+    content = json.dumps(list(range(100)))
+    monkeypatch.setattr(chat_interface_old, "_JSON_STREAM_THRESHOLD", 0)
+    monkeypatch.setattr(chat_interface_old.ijson, "backend", "python")
+
+    assert not chat_interface_old._can_stream_json(content)
+
+
+def test_analysis_cache_keys_on_content_digest(tmp_path):
+    """Test that cached reports are found by content without keeping the text alive."""
+    chat = ChatInterface(CLIConfig(str(tmp_path / "config.json")))
+    content = "def f():\n    return 1\n" * 50
+
+    first = chat._analyze_file_content(content, "python", "a.py")
+    again = chat._analyze_file_content("".join([content]), "python", "a.py")
+    changed = chat._analyze_file_content(content + "x = 1\n", "python", "a.py")
+
+    assert again == first
+    assert changed != first
+    assert len(chat._analysis_cache) == 2
+    assert all(content not in key for key in chat._analysis_cache)
+    assert content not in chat._last_python_outline
+
+
+@pytest.mark.parametrize(
+    "model, expected",
+    [(None, "gpt-4o-mini"), ("nope", "gpt-4o-mini"), ("o1", "o1")],
+)
+def test_history_records_resolved_model(tmp_path, model, expected):
+    """Test that the history shows the model a message resolved to, not the raw argument."""
+    config = CLIConfig(str(tmp_path / "config.json"))
+    config.set_token("ghp_example")
+    chat = ChatInterface(config)
+
+    chat.send_message("hello", model=model)
+
+    assert chat.get_session_history()[0]["model"] == expected
+
+
+def test_agent_mode_lists_enabled_mcp_servers(tmp_path):
+    """Test that the agent-mode reply lists only enabled MCP servers."""
+    config = CLIConfig(str(tmp_path / "config.json"))
+    config.set("mcp.servers", {
+        "on": {"name": "On Server", "description": "Enabled", "enabled": True},
+        "off": {"name": "Off Server", "enabled": False},
+    })
+    chat = ChatInterface(config)
+
+    content = chat._generate_agent_mode_response("plan a refactor", {}, {}, "Model")["content"]
+
+    assert "(1 servers enabled)" in content
+    assert "• **On Server** - Enabled" in content
+    assert "Off Server" not in content
@@ -0,0 +1,86 @@
+"""
+Tests for CLI argument parsing
+"""
+
+import contextlib
+import io
+import os
+import shlex
+import sys
+
+import pytest
+
+# Add the package to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from vscodey.copilot.cli import _build_parser, _sniff_subcommand
+
+ARGV_CASES = [
+    "",
+    "--help",
+    "chat hi",
+    "chat --help",
+    "chat hi -m x --nope",
+    "chat 'explain this' --file a.py --file b.py --context --agent terminal",
+    "auth",
+    "auth bogus",
+    "auth login --client-id abc",
+    "-v auth status",
+    "mcp",
+    "mcp enable",
+    "--verbose mcp list",
+    "mcp enable github",
+    "bogus",
+    "--config",
+    "--workspace chat list-models",
+    "--config=/tmp/config.json list-agents",
+    "--work . list-agents",
+    "-v set-model",
+    "set-model gpt-4o",
+    "list-models extra",
+    "set-agent terminal",
+    "interactive --agent workspace",
+]
+
+
+def parse(argv, command):
+    """Parse argv with the parser built for command; report the outcome and output."""
+    parser, _ = _build_parser(command)
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            result = vars(parser.parse_args(argv))
+        except SystemExit as e:
+            result = e.code
+    return result, out.getvalue(), err.getvalue()
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        (["chat", "hi"], "chat"),
+        (["-v", "auth", "status"], "auth"),
+        (["--config", "c.json", "models"], None),
+        (["--config", "c.json", "list-models"], "list-models"),
+        (["--config=c.json", "mcp", "list"], "mcp"),
+        (["--workspace", "chat"], None),
+        (["--help", "chat"], None),
+        (["chat", "--help"], "chat"),
+        (["bogus"], None),
+        ([], None),
+    ],
+)
+def test_sniff_subcommand(argv, expected):
+    """Test that the subcommand is found after global options and their values."""
+    assert _sniff_subcommand(argv) == expected
+
+
+@pytest.mark.parametrize("args", ARGV_CASES)
+def test_sniffed_parser_matches_full_parser(args):
+    """Test that parsing with only the sniffed subparser matches the full parser.
+
+    Parsed values, exit codes, help text and error messages must all agree.
+    """
+    argv = shlex.split(args)
+
+    assert parse(argv, _sniff_subcommand(argv)) == parse(argv, None)
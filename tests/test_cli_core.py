@@ -0,0 +1,24 @@
+"""
+Tests for CLI Pilot context gathering
+"""
+
+import os
+import sys
+
+# Add the package to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from vscodey.copilot.cli_core import CLIPilot
+
+
+def test_binary_context_file_is_skipped_with_warning(tmp_path, capsys):
+    """Test that a non-UTF-8 --file argument warns instead of joining the prompt."""
+    (tmp_path / "notes.txt").write_text("héllo", encoding="utf-8")
+    (tmp_path / "image.png").write_bytes(b"\x89PNG\r\n\x1a\n\xff\xfe\x00")
+    pilot = CLIPilot(workspace=str(tmp_path), config_path=str(tmp_path / "config.json"))
+
+    context = pilot._gather_context(["notes.txt", "image.png"], False)
+
+    assert [entry["path"] for entry in context["files"]] == ["notes.txt"]
+    assert context["files"][0]["preview"] == "héllo"
+    assert "Could not read file image.png" in capsys.readouterr().out
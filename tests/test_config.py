@@ -0,0 +1,115 @@
+"""
+Tests for CLI Pilot configuration persistence
+"""
+
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+# Add the package to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from vscodey.copilot.config import CLIConfig
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    """Path of a config file inside a temporary directory."""
+    return tmp_path / "config.json"
+
+
+def test_save_writes_complete_file_without_temp(config_path):
+    """Test that a save leaves valid JSON and no temp file behind."""
+    config = CLIConfig(str(config_path))
+    config.set("chat.temperature", 0.5)
+
+    saved = json.loads(config_path.read_text())
+    assert saved["chat"]["temperature"] == 0.5
+    assert list(config_path.parent.iterdir()) == [config_path]
+
+
+def test_failed_save_keeps_old_file(config_path, monkeypatch):
+    """Test that an interrupted save neither truncates the config nor leaks the temp file."""
+    config = CLIConfig(str(config_path))
+    config.set("chat.temperature", 0.5)
+    before = config_path.read_bytes()
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    with pytest.raises(Exception, match="Could not save config"):
+        config.set("chat.temperature", 0.9)
+
+    assert config_path.read_bytes() == before
+    assert list(config_path.parent.iterdir()) == [config_path]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_save_preserves_permissions(config_path):
+    """Test that saving keeps the permissions the user set on the config file."""
+    config = CLIConfig(str(config_path))
+    config.set("chat.temperature", 0.5)
+    os.chmod(config_path, 0o600)
+
+    config.set_token("ghp_example")
+
+    assert stat.S_IMODE(config_path.stat().st_mode) == 0o600
+
+
+def test_corrupt_config_is_not_overwritten(config_path, capsys):
+    """Test that an unreadable config falls back to defaults and is left on disk."""
+    config_path.write_text("{not json")
+
+    config = CLIConfig(str(config_path))
+
+    assert config.get_default_model() == "gpt-4o-mini"
+    assert config_path.read_text() == "{not json"
+    assert "Could not load config" in capsys.readouterr().out
+
+
+def test_batch_saves_once(config_path, monkeypatch):
+    """Test that set() calls inside nested batch() blocks are written in one save."""
+    config = CLIConfig(str(config_path))
+    saves = []
+    monkeypatch.setattr(config, "_save_config", lambda: saves.append(True))
+
+    with config.batch():
+        config.set("chat.temperature", 0.5)
+        with config.batch():
+            config.set("chat.default_agent", "terminal")
+        assert saves == []
+
+    assert saves == [True]
+    assert config.get("chat.default_agent") == "terminal"
+
+
+def test_batch_saves_when_block_raises(config_path):
+    """Test that a batch interrupted by an exception still persists its changes."""
+    config = CLIConfig(str(config_path))
+
+    with pytest.raises(RuntimeError):
+        with config.batch():
+            config.set("chat.temperature", 0.5)
+            raise RuntimeError("boom")
+
+    assert json.loads(config_path.read_text())["chat"]["temperature"] == 0.5
+
+
+def test_import_merges_nested_sections(config_path, tmp_path):
+    """Test that importing a partial file keeps the keys it leaves out."""
+    config = CLIConfig(str(config_path))
+    config.set_token("ghp_example")
+    partial = tmp_path / "partial.json"
+    partial.write_text(json.dumps({"chat": {"temperature": 0.7}}))
+
+    config.import_config(str(partial))
+
+    assert config.get("chat.temperature") == 0.7
+    assert config.get("chat.default_model") == "gpt-4o-mini"
+    assert "gpt-4o-mini" in config.get_available_models()
+    assert config.get("auth.token") == "ghp_example"
+    assert json.loads(config_path.read_text())["chat"]["temperature"] == 0.7
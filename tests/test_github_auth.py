@@ -0,0 +1,49 @@
+"""
+Tests for GitHub authentication helpers
+"""
+
+import os
+import signal
+import sys
+import threading
+
+import pytest
+
+# Add the package to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from vscodey.copilot import chat_interface, github_auth
+from vscodey.copilot.github_auth import cancel_on_interrupt
+
+
+def test_first_interrupt_sets_event_second_raises():
+    """Test that Ctrl-C cancels the wait first and aborts on the second press."""
+    stop = threading.Event()
+    previous_handler = signal.getsignal(signal.SIGINT)
+
+    with pytest.raises(KeyboardInterrupt):
+        with cancel_on_interrupt(stop):
+            signal.raise_signal(signal.SIGINT)
+            assert stop.is_set()
+            signal.raise_signal(signal.SIGINT)
+
+    assert signal.getsignal(signal.SIGINT) is previous_handler
+
+
+@pytest.mark.parametrize(
+    "auth_class", [github_auth.GitHubAuth, chat_interface.GitHubAuth]
+)
+def test_cancelled_login_reports_cancellation(auth_class, monkeypatch, capsys):
+    """Test that both device-flow implementations report a cancelled login as such."""
+    auth = auth_class()
+
+    def cancelled_poll(device_info):
+        auth.cancel()
+        return None
+
+    monkeypatch.setattr(auth, "_request_device_code", lambda: {"device_code": "d"})
+    monkeypatch.setattr(auth, "_display_user_code", lambda device_info: None)
+    monkeypatch.setattr(auth, "_poll_for_token", cancelled_poll)
+
+    assert auth.authenticate() is None
+    assert "Authentication cancelled" in capsys.readouterr().out
@@ -2,25 +2,40 @@
 VSCodey Copilot - Core functionality for GitHub Copilot Chat without VSCode
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "VSCodey Team"
 __description__ = "CLI Pilot - GitHub Copilot Chat for Command Line"
 
-# Import main classes for easy access
-try:
-    from .cli_core import CLIPilot
-    from .chat_interface import ChatInterface
-    from .config import CLIConfig
-    from .context_manager import WorkspaceContextManager
-    from .github_auth import GitHubAuth
-
-    __all__ = [
-        'CLIPilot', 
-        'ChatInterface', 
-        'CLIConfig', 
-        'WorkspaceContextManager', 
-        'GitHubAuth'
-    ]
-except ImportError:
-    # Graceful fallback if some modules are missing
-    __all__ = []
\ No newline at end of file
+# Main classes for easy access. They are imported on first use, so that
+# e.g. `vscodey-copilot --help` doesn't load the chat, auth and HTTP stacks.
+_LAZY_EXPORTS = {
+    'CLIPilot': '.cli_core',
+    'ChatInterface': '.chat_interface',
+    'CLIConfig': '.config',
+    'WorkspaceContextManager': '.context_manager',
+    'GitHubAuth': '.github_auth',
+}
+
+__all__ = [
+    'CLIPilot', 
+    'ChatInterface', 
+    'CLIConfig', 
+    'WorkspaceContextManager', 
+    'GitHubAuth'
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups skip this hook
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
@@ -4,16 +4,30 @@ Chat interface for VSCodey Copilot - Real GitHub Copilot integration framework.
 
 import time
 import os
+import copy
 import json
 import uuid
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 import subprocess
-import platform
+import sys
 import requests
-from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    # Optional speedup; fall back to the standard library
+    orjson = None
 
 from .config import CLIConfig
+from .github_auth import cancel_on_interrupt, create_github_session, get_github_user
 
 
 class GitHubAuth:
@@ -25,10 +39,16 @@ class GitHubAuth:
     USER_URL = "https://api.github.com/user"
     COPILOT_TOKEN_URL = "https://api.github.com/copilot_internal/v2/token"
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, session: Optional[requests.Session] = None):
         self.verbose = verbose
         # Default client ID for CLI applications (GitHub CLI)
         self.client_id = "178c6fc778ccc68e1d6a"  # GitHub CLI client ID
+        self.session = session or create_github_session("VSCodey-Copilot/1.0")
+        self._stop = threading.Event()
+    
+    def cancel(self):
+        """Cancel an in-progress token poll."""
+        self._stop.set()
     
     def authenticate(self) -> Optional[str]:
         """Perform GitHub authentication using device flow."""
@@ -44,13 +64,20 @@ class GitHubAuth:
             # Step 2: Show user code and open browser
             self._display_user_code(device_info)
             
-            # Step 3: Poll for access token
-            access_token = self._poll_for_token(device_info)
+            # Step 3: Poll for access token (Ctrl-C cancels the wait)
+            self._stop.clear()
+            with cancel_on_interrupt(self._stop):
+                access_token = self._poll_for_token(device_info)
             
-            if access_token and self.verify_token(access_token):
+            # No separate /user check here: the Copilot token exchange that
+            # follows rejects an invalid GitHub token on its own
+            if access_token:
                 if self.verbose:
                     print("✓ GitHub authentication successful!")
                 return access_token
+            elif self._stop.is_set():
+                print("✗ Authentication cancelled.")
+                return None
             else:
                 if self.verbose:
                     print("✗ GitHub authentication failed or timed out.")
@@ -68,16 +95,10 @@ class GitHubAuth:
             "scope": "read:user user:email"
         }
         
-        headers = {
-            "Accept": "application/json",
-            "User-Agent": "VSCodey-Copilot/1.0"
-        }
-        
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.DEVICE_CODE_URL,
                 data=data,
-                headers=headers,
                 timeout=30
             )
             
@@ -113,9 +134,9 @@ class GitHubAuth:
         expires_in = device_info.get('expires_in', 900)
         device_code = device_info['device_code']
         
-        start_time = time.time()
+        start_time = time.monotonic()
         
-        while time.time() - start_time < expires_in:
+        while time.monotonic() - start_time < expires_in:
             try:
                 data = {
                     "client_id": self.client_id,
@@ -123,15 +144,9 @@ class GitHubAuth:
                     "grant_type": "urn:ietf:params:oauth:grant-type:device_code"
                 }
                 
-                headers = {
-                    "Accept": "application/json",
-                    "User-Agent": "VSCodey-Copilot/1.0"
-                }
-                
-                response = requests.post(
+                response = self.session.post(
                     self.ACCESS_TOKEN_URL,
                     data=data,
-                    headers=headers,
                     timeout=30
                 )
                 
@@ -147,12 +162,14 @@ class GitHubAuth:
                     
                     if error == 'authorization_pending':
                         # Still waiting for user authorization
-                        time.sleep(interval)
+                        if self._stop.wait(interval):
+                            return None
                         continue
                     elif error == 'slow_down':
                         # Increase polling interval
                         interval += 5
-                        time.sleep(interval)
+                        if self._stop.wait(interval):
+                            return None
                         continue
                     elif error in ('expired_token', 'access_denied'):
                         # Terminal errors
@@ -160,41 +177,51 @@ class GitHubAuth:
                             print(f"Authentication {error}")
                         return None
                 
-                time.sleep(interval)
+                if self._stop.wait(interval):
+                    return None
                 
             except Exception as e:
                 if self.verbose:
                     print(f"Polling error: {e}")
-                time.sleep(interval)
+                if self._stop.wait(interval):
+                    return None
         
         return None
     
     def verify_token(self, token: str) -> bool:
         """Verify GitHub token validity."""
-        try:
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Accept": "application/vnd.github+json",
-                "User-Agent": "VSCodey-Copilot/1.0"
-            }
-            
-            response = requests.get(self.USER_URL, headers=headers, timeout=10)
-            return response.status_code == 200
-        except:
-            return False
+        user = get_github_user(token, verbose=self.verbose, session=self.session)
+        return user is not None
 
 
 class CopilotTokenManager:
     """Manages Copilot token exchange from GitHub token - based on ori token manager"""
     
-    def __init__(self, verbose: bool = False):
+    # On-disk token cache, stored next to the CLI Pilot configuration
+    TOKEN_CACHE_FILE = CLIConfig.DEFAULT_CONFIG_DIR / "copilot_token.json"
+    
+    def __init__(
+        self,
+        verbose: bool = False,
+        cache_path: Optional[Path] = None,
+        session: Optional[requests.Session] = None
+    ):
         self.verbose = verbose
+        self.session = session or create_github_session("VSCodey-Copilot/1.0")
         self.copilot_token = None
         self.github_token = None
+        self.cache_path = Path(cache_path) if cache_path else self.TOKEN_CACHE_FILE
+        self._token_owner = None
+        self._load_cached_token()
     
     def get_copilot_token(self, github_token: str) -> Optional[str]:
         """Exchange GitHub token for Copilot token."""
-        if self.copilot_token and self._is_token_valid():
+        if (
+            self.copilot_token
+            and self._token_owner == self._token_key(github_token)
+            and self._is_token_valid()
+        ):
+            self.github_token = github_token
             return self.copilot_token
         
         try:
@@ -204,14 +231,13 @@ class CopilotTokenManager:
             headers = {
                 "Authorization": f"token {github_token}",
                 "X-GitHub-Api-Version": "2025-04-01",
-                "Accept": "application/json",
                 "User-Agent": "copilot-chat/0.30.0",
                 "Editor-Version": "vscode/1.95.0",
                 "Editor-Plugin-Version": "copilot-chat/0.30.0"
             }
             
-            response = requests.post(
-                "https://api.github.com/copilot_internal/v2/token",
+            response = self.session.post(
+                GitHubAuth.COPILOT_TOKEN_URL,
                 headers=headers,
                 timeout=30
             )
@@ -221,12 +247,15 @@ class CopilotTokenManager:
                 self.copilot_token = token_info.get('token')
                 self.token_expires_at = time.time() + token_info.get('expires_in', 3600)
                 self.github_token = github_token
+                self._token_owner = self._token_key(github_token)
+                self._save_cached_token()
                 
                 if self.verbose:
                     print("✓ Copilot token obtained successfully")
                 
                 return self.copilot_token
             elif response.status_code == 401:
+                self.invalidate()
                 if self.verbose:
                     print("✗ GitHub token invalid for Copilot access")
                 return None
@@ -255,11 +284,179 @@ class CopilotTokenManager:
         
         # Check expiration (with 5 minute buffer)
         return hasattr(self, 'token_expires_at') and time.time() < (self.token_expires_at - 300)
+    
+    def invalidate(self):
+        """Forget the current Copilot token and remove it from the disk cache."""
+        self.copilot_token = None
+        self.github_token = None
+        self._token_owner = None
+        try:
+            self.cache_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            if self.verbose:
+                print(f"Could not remove Copilot token cache: {e}")
+    
+    @staticmethod
+    def _token_key(github_token: str) -> str:
+        """Key cache entries by GitHub identity without storing the token itself."""
+        return hashlib.sha256(github_token.encode("utf-8")).hexdigest()
+    
+    def _load_cached_token(self):
+        """Load a previously exchanged Copilot token from the disk cache."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if not isinstance(cached, dict) or not cached.get("token"):
+            return
+        
+        self.copilot_token = cached["token"]
+        self.token_expires_at = cached.get("expires_at", 0)
+        self._token_owner = cached.get("key")
+    
+    def _save_cached_token(self):
+        """Atomically write the current Copilot token to the disk cache."""
+        cached = {
+            "key": self._token_owner,
+            "token": self.copilot_token,
+            "expires_at": self.token_expires_at,
+        }
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Created owner-only so the token is never readable by others,
+            # not even between the write and the rename; O_EXCL makes sure
+            # a leftover temp file cannot keep wider permissions
+            try:
+                tmp_path.unlink()
+            except FileNotFoundError:
+                pass
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cached, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            if self.verbose:
+                print(f"Could not write Copilot token cache: {e}")
+
+
+# Characters of each context file sent to the model
+MAX_PREVIEW = 1000
+
+
+def read_file_preview(path: Union[str, Path], limit: int = MAX_PREVIEW) -> str:
+    """Read the beginning of a file for use as chat context.
+
+    Only ``limit + 1`` characters are read, so large files are never loaded
+    whole just to be truncated.
+
+    Args:
+        path: File to read
+        limit: Maximum number of characters to keep
+
+    Returns:
+        File preview, with "..." appended when the file was truncated
+
+    Raises:
+        UnicodeDecodeError: If the file is binary or not UTF-8, so callers
+            warn about it instead of sending undecodable text as context
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read(limit + 1)
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _json_loads(data: Any) -> Any:
+    """Parse JSON from bytes or str, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a request body to UTF-8 JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+# File extension to language name, with interned keys for cheap lookups
+_LANGUAGE_MAP = {
+    sys.intern(suffix): language
+    for suffix, language in {
+        '.py': 'python',
+        '.js': 'javascript',
+        '.ts': 'typescript',
+        '.jsx': 'javascript',
+        '.tsx': 'typescript',
+        '.java': 'java',
+        '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp',
+        '.c': 'c',
+        '.h': 'c', '.hpp': 'cpp',
+        '.cs': 'csharp',
+        '.php': 'php',
+        '.rb': 'ruby',
+        '.go': 'go',
+        '.rs': 'rust',
+        '.swift': 'swift',
+        '.kt': 'kotlin',
+        '.scala': 'scala',
+        '.md': 'markdown',
+        '.json': 'json',
+        '.yaml': 'yaml', '.yml': 'yaml',
+        '.xml': 'xml',
+        '.html': 'html',
+        '.css': 'css'
+    }.items()
+}
+
+
+# System prompts per agent, built once at import
+_SYSTEM_PROMPTS = MappingProxyType({
+    "workspace": """You are GitHub Copilot, an AI coding assistant. You help developers understand, write, and improve code. 
+You have access to the current workspace context and can provide insights about the codebase, suggest improvements, and answer coding questions.
+Be helpful, accurate, and concise in your responses.""",
+    
+    "terminal": """You are GitHub Copilot in terminal mode. You help with command-line operations, shell commands, and system administration tasks.
+You can analyze system information and suggest appropriate commands for the user's platform.
+Be practical and provide working command examples.""",
+    
+    "explain": """You are GitHub Copilot in explanation mode. You excel at explaining code, algorithms, and programming concepts.
+Break down complex topics into understandable parts and provide clear, educational explanations.
+Use examples and analogies when helpful."""
+})
+
+
+# Workspace contexts keyed by path, stored with the signature they were built
+# for and when. Least recently used entries are evicted past _WS_CACHE_SIZE.
+_WS_CACHE: "OrderedDict[str, Tuple[Tuple[int, ...], float, Dict[str, Any]]]" = OrderedDict()
+_WS_CACHE_SIZE = 16
+# Edits to tracked files change no mtime the signature looks at, so entries
+# also expire; git_info["has_changes"] is at most this many seconds stale
+_WS_CACHE_TTL = 5.0
 
 
 class WorkspaceContextManager:
     """Enhanced workspace context management with real file analysis."""
     
+    # Common project files and the project type they indicate
+    PROJECT_FILES = {
+        "package.json": "nodejs",
+        "requirements.txt": "python",
+        "pyproject.toml": "python",
+        "Cargo.toml": "rust",
+        "go.mod": "go",
+        "pom.xml": "java"
+    }
+    
     def __init__(self, workspace_path: Path, verbose: bool = False):
         self.workspace_path = workspace_path
         self.verbose = verbose
@@ -267,34 +464,65 @@ class WorkspaceContextManager:
     def get_workspace_context(self) -> Dict[str, Any]:
         """Get comprehensive workspace context with real data."""
         try:
+            key = str(self.workspace_path)
+            signature = self._get_signature()
+            now = time.monotonic()
+            cached = _WS_CACHE.get(key)
+            if cached and cached[0] == signature and now - cached[1] < _WS_CACHE_TTL:
+                _WS_CACHE.move_to_end(key)
+                # Callers get their own copy; the cached one stays pristine
+                return copy.deepcopy(cached[2])
+            
+            is_git_repo = (self.workspace_path / ".git").exists()
             context = {
-                "path": str(self.workspace_path),
+                "path": key,
                 "exists": self.workspace_path.exists(),
-                "is_git_repo": (self.workspace_path / ".git").exists(),
+                "is_git_repo": is_git_repo,
                 "project_info": self._get_project_info(),
-                "git_info": self._get_git_info() if (self.workspace_path / ".git").exists() else None,
+                "git_info": self._get_git_info() if is_git_repo else None,
                 "file_structure": self._get_basic_structure()
             }
+            _WS_CACHE[key] = (signature, now, copy.deepcopy(context))
+            _WS_CACHE.move_to_end(key)
+            if len(_WS_CACHE) > _WS_CACHE_SIZE:
+                _WS_CACHE.popitem(last=False)
             return context
         except Exception as e:
             return {"error": str(e)}
     
+    def _get_signature(self) -> Tuple[int, ...]:
+        """Get modification times that invalidate a cached workspace context.
+        
+        The workspace directory mtime covers added/removed top-level entries,
+        .git/HEAD covers branch switches and .git/index covers staging and
+        commits. Unstaged edits to tracked files change none of these; they
+        are only picked up once the entry's _WS_CACHE_TTL runs out.
+        """
+        signature = []
+        for path in (
+            self.workspace_path,
+            self.workspace_path / ".git" / "HEAD",
+            self.workspace_path / ".git" / "index",
+        ):
+            try:
+                signature.append(path.stat().st_mtime_ns)
+            except OSError:
+                signature.append(0)
+        return tuple(signature)
+    
     def _get_project_info(self) -> Dict[str, Any]:
         """Detect project type and configuration."""
         project_info = {"type": "unknown", "configs": []}
         
-        # Check for common project files
-        project_files = {
-            "package.json": "nodejs",
-            "requirements.txt": "python", 
-            "pyproject.toml": "python",
-            "Cargo.toml": "rust",
-            "go.mod": "go",
-            "pom.xml": "java"
-        }
+        # One directory listing instead of a stat per candidate file
+        try:
+            with os.scandir(self.workspace_path) as entries:
+                names = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            return project_info
         
-        for file_name, project_type in project_files.items():
-            if (self.workspace_path / file_name).exists():
+        for file_name, project_type in self.PROJECT_FILES.items():
+            if file_name in names:
                 project_info["type"] = project_type
                 project_info["configs"].append(file_name)
         
@@ -303,9 +531,10 @@ class WorkspaceContextManager:
     def _get_git_info(self) -> Dict[str, Any]:
         """Get real Git repository information."""
         try:
-            # Get current branch
+            # A single porcelain v2 status reports both the branch header
+            # and the changed entries, so only one git process is spawned
             result = subprocess.run(
-                ["git", "branch", "--show-current"],
+                ["git", "status", "--branch", "--porcelain=v2"],
                 cwd=self.workspace_path,
                 capture_output=True,
                 text=True,
@@ -314,19 +543,14 @@ class WorkspaceContextManager:
             
             git_info = {}
             if result.returncode == 0:
-                git_info["branch"] = result.stdout.strip()
-            
-            # Get status
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=self.workspace_path,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                git_info["has_changes"] = bool(result.stdout.strip())
+                has_changes = False
+                for line in result.stdout.splitlines():
+                    if line.startswith("# branch.head "):
+                        branch = line[len("# branch.head "):]
+                        git_info["branch"] = "" if branch == "(detached)" else branch
+                    elif line and not line.startswith("#"):
+                        has_changes = True
+                git_info["has_changes"] = has_changes
             
             return git_info
         except Exception:
@@ -335,16 +559,39 @@ class WorkspaceContextManager:
     def _get_basic_structure(self) -> Dict[str, Any]:
         """Get basic directory structure."""
         try:
-            items = list(self.workspace_path.iterdir())
+            # DirEntry caches the entry type from the directory listing, so
+            # one pass needs no per-item stat calls
+            total_items = directories = files = 0
+            with os.scandir(self.workspace_path) as entries:
+                for entry in entries:
+                    total_items += 1
+                    if entry.is_dir():
+                        directories += 1
+                    elif entry.is_file():
+                        files += 1
             return {
-                "total_items": len(items),
-                "directories": len([item for item in items if item.is_dir()]),
-                "files": len([item for item in items if item.is_file()])
+                "total_items": total_items,
+                "directories": directories,
+                "files": files
             }
         except Exception:
             return {"error": "Structure analysis failed"}
 
 
+# Longest Retry-After wait honored before a rate-limited request is retried
+RETRY_AFTER_MAX = 30
+
+
+class _CappedRetry(Retry):
+    """Retry policy that never sleeps longer than RETRY_AFTER_MAX for Retry-After."""
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, RETRY_AFTER_MAX)
+
+
 class GitHubCopilotAPIClient:
     """Real GitHub Copilot API client based on ori extension architecture"""
     
@@ -364,6 +611,24 @@ class GitHubCopilotAPIClient:
             "X-GitHub-Api-Version": "2025-04-01",
             "Content-Type": "application/json"
         })
+        
+        # Retry rate limits and transient gateway errors, waiting as long as
+        # the server asks via Retry-After (up to RETRY_AFTER_MAX); the final
+        # response is returned rather than raised so the usual error mapping
+        # still applies. Read errors are never retried: the completion may
+        # already be generating, and a timeout should surface as a timeout.
+        retry = _CappedRetry(
+            total=4,
+            read=False,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
     def send_chat_request(
         self,
@@ -389,10 +654,10 @@ class GitHubCopilotAPIClient:
                 request_body["tools"] = tools
             
             # Add request ID for tracking
-            request_id = str(uuid.uuid4())
+            request_id, interaction_id = self._new_request_ids()
             headers = {
                 "X-Request-Id": request_id,
-                "X-Interaction-Id": str(uuid.uuid4())
+                "X-Interaction-Id": interaction_id
             }
             
             if self.verbose:
@@ -403,13 +668,13 @@ class GitHubCopilotAPIClient:
             
             response = self.session.post(
                 self.CHAT_COMPLETIONS_URL,
-                json=request_body,
+                data=_json_dumps(request_body),
                 headers=headers,
                 timeout=60
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = _json_loads(response.content)
                 if self.verbose:
                     print("✓ Chat completion successful")
                 
@@ -421,23 +686,76 @@ class GitHubCopilotAPIClient:
                     "request_id": request_id
                 }
             
-            elif response.status_code == 401:
-                return {"success": False, "error": "Unauthorized - invalid Copilot token"}
-            elif response.status_code == 403:
-                return {"success": False, "error": "Forbidden - no Copilot access or quota exceeded"}
-            elif response.status_code == 429:
-                return {"success": False, "error": "Rate limit exceeded"}
-            else:
-                error_text = response.text
-                if self.verbose:
-                    print(f"✗ API request failed: {response.status_code}")
-                    print(f"   Error: {error_text}")
+            return self._error_result(response)
                 
+        except requests.exceptions.Timeout:
+            return {"success": False, "error": "Request timeout"}
+        except requests.exceptions.ConnectionError:
+            return {"success": False, "error": "Connection error - check internet connection"}
+        except Exception as e:
+            if self.verbose:
+                print(f"✗ Unexpected error: {e}")
+            return {"success": False, "error": f"Unexpected error: {str(e)}"}
+    
+    def send_chat_request_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.1,
+        max_tokens: int = 4096,
+        tools: Optional[List[Dict]] = None
+    ) -> Dict[str, Any]:
+        """Send a streaming chat completion request to GitHub Copilot API.
+        
+        On success the result carries a ``stream`` iterator that yields
+        content chunks as the server generates them; errors are reported
+        the same way as in send_chat_request.
+        """
+        try:
+            request_body = {
+                "messages": messages,
+                "model": model,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True
+            }
+            
+            if tools:
+                request_body["tools"] = tools
+            
+            request_id, interaction_id = self._new_request_ids()
+            headers = {
+                "X-Request-Id": request_id,
+                "X-Interaction-Id": interaction_id,
+                "Accept": "text/event-stream"
+            }
+            
+            if self.verbose:
+                print("🚀 Sending streaming chat request to GitHub Copilot API")
+                print(f"   Model: {model}")
+                print(f"   Messages: {len(messages)}")
+                print(f"   Request ID: {request_id}")
+            
+            response = self.session.post(
+                self.CHAT_COMPLETIONS_URL,
+                data=_json_dumps(request_body),
+                headers=headers,
+                timeout=60,
+                stream=True
+            )
+            
+            if response.status_code == 200:
                 return {
-                    "success": False, 
-                    "error": f"API request failed: {response.status_code}",
-                    "details": error_text
+                    "success": True,
+                    "stream": self._iter_stream_content(response),
+                    "model": model,
+                    "request_id": request_id
                 }
+            
+            try:
+                return self._error_result(response)
+            finally:
+                response.close()
                 
         except requests.exceptions.Timeout:
             return {"success": False, "error": "Request timeout"}
@@ -447,6 +765,71 @@ class GitHubCopilotAPIClient:
             if self.verbose:
                 print(f"✗ Unexpected error: {e}")
             return {"success": False, "error": f"Unexpected error: {str(e)}"}
+    
+    @staticmethod
+    def _new_request_ids() -> Tuple[str, str]:
+        """Generate the request and interaction IDs for one API call.
+        
+        Only the request ID draws fresh randomness; the interaction ID is
+        derived from it with a name-based UUID.
+        """
+        request_id = uuid.uuid4()
+        interaction_id = uuid.uuid5(request_id, "interaction")
+        return str(request_id), str(interaction_id)
+    
+    def _iter_stream_content(self, response: requests.Response) -> Iterator[str]:
+        """Yield content deltas from a server-sent events chat completion."""
+        with response:
+            # SSE is UTF-8 by definition, but requests falls back to
+            # ISO-8859-1 for text/* without a charset, so decode here
+            for raw_line in response.iter_lines():
+                line = raw_line.decode("utf-8")
+                if not line.startswith("data:"):
+                    continue
+                
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                
+                try:
+                    chunk = _json_loads(data)
+                except ValueError:
+                    if self.verbose:
+                        print(f"✗ Skipping malformed stream frame: {data[:80]}")
+                    continue
+                
+                for choice in chunk.get("choices") or []:
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield content
+    
+    def _error_result(self, response: requests.Response) -> Dict[str, Any]:
+        """Map a non-200 chat completion response to an error result.
+        
+        Only the status code is inspected, so streamed error bodies are
+        never read unless verbose output needs them.
+        """
+        if response.status_code == 401:
+            return {"success": False, "error": "Unauthorized - invalid Copilot token"}
+        elif response.status_code == 403:
+            return {"success": False, "error": "Forbidden - no Copilot access or quota exceeded"}
+        elif response.status_code == 429:
+            return {"success": False, "error": "Rate limit exceeded"}
+        else:
+            # The body is only worth downloading and decoding when someone
+            # will read it; otherwise the status reason is enough detail
+            if self.verbose:
+                details = response.text
+                print(f"✗ API request failed: {response.status_code}")
+                print(f"   Error: {details}")
+            else:
+                details = response.reason
+            
+            return {
+                "success": False, 
+                "error": f"API request failed: {response.status_code}",
+                "details": details
+            }
 
 
 class ChatInterface:
@@ -461,17 +844,33 @@ class ChatInterface:
         """
         self.config = config
         self.verbose = verbose
-        self.session_history = []
-        self.github_auth = GitHubAuth(verbose=verbose)
-        self.token_manager = CopilotTokenManager(verbose=verbose)
+        # Bounded so long interactive sessions don't grow memory without limit
+        self.session_history = deque(maxlen=self.config.get("chat.history_max", 2000))
+        # One pooled connection shared by the auth flow and the token exchange
+        self.http_session = create_github_session("VSCodey-Copilot/1.0")
+        self.github_auth = GitHubAuth(verbose=verbose, session=self.http_session)
+        self.token_manager = CopilotTokenManager(verbose=verbose, session=self.http_session)
         self.github_token = None
         self.api_client = None
+        self._ws_managers: Dict[str, WorkspaceContextManager] = {}
+        self._workspace_prefetch: Optional[Tuple[str, Future]] = None
+
+    def authenticate(self, workspace: Optional[str] = None) -> bool:
+        """Authenticate with GitHub and get Copilot token.
 
-    def authenticate(self) -> bool:
-        """Authenticate with GitHub and get Copilot token."""
+        Args:
+            workspace: Optional workspace path whose context is gathered in the
+                background while the device flow waits on the user
+
+        Returns:
+            True if authentication succeeded, False otherwise
+        """
         if self.verbose:
             print("🔑 Starting GitHub Copilot authentication process...")
         
+        if workspace:
+            self._start_workspace_prefetch(workspace)
+        
         # Step 1: Get GitHub token
         self.github_token = self.github_auth.authenticate()
         if not self.github_token:
@@ -494,12 +893,69 @@ class ChatInterface:
         
         return True
 
+    def _get_workspace_manager(self, workspace: str) -> WorkspaceContextManager:
+        """Get the context manager for a workspace, creating it on first use.
+
+        Args:
+            workspace: Workspace path
+
+        Returns:
+            Workspace context manager reused for the rest of the session
+        """
+        manager = self._ws_managers.get(workspace)
+        if manager is None:
+            manager = WorkspaceContextManager(Path(workspace), verbose=self.verbose)
+            self._ws_managers[workspace] = manager
+        return manager
+
+    def _start_workspace_prefetch(self, workspace: str):
+        """Gather workspace context on a worker thread.
+
+        Args:
+            workspace: Workspace path to analyze
+        """
+        manager = self._get_workspace_manager(workspace)
+        executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="workspace-prefetch"
+        )
+        future = executor.submit(manager.get_workspace_context)
+        executor.shutdown(wait=False)
+        self._workspace_prefetch = (workspace, future)
+
+    def _take_prefetched_context(self, workspace: str) -> Optional[Dict[str, Any]]:
+        """Return the prefetched context for a workspace, consuming the prefetch.
+
+        A prefetch for another workspace is discarded, and a failed one is
+        ignored so the caller falls back to a fresh scan.
+
+        Args:
+            workspace: Workspace path the caller needs context for
+
+        Returns:
+            Workspace context, or None if none is available for this path
+        """
+        if self._workspace_prefetch is None:
+            return None
+
+        prefetched_workspace, future = self._workspace_prefetch
+        self._workspace_prefetch = None
+        if prefetched_workspace != workspace:
+            return None
+
+        try:
+            return future.result()
+        except Exception as e:
+            if self.verbose:
+                print(f"Workspace prefetch failed, rescanning: {e}")
+            return None
+
     def send_message(
         self,
         message: str,
         context: Dict[str, Any] = None,
         agent: Optional[str] = None,
         model: Optional[str] = None,
+        on_content: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         """Send a message to the chat system.
 
@@ -508,9 +964,11 @@ class ChatInterface:
             context: Context information
             agent: Specific agent to use
             model: Specific model to use
+            on_content: Optional callback; when given the completion is
+                streamed and each content chunk is passed to it as it arrives
 
         Returns:
-            Response dictionary
+            Response dictionary; with on_content, "content" holds the full text
         """
         try:
             # Check if authenticated
@@ -529,7 +987,7 @@ class ChatInterface:
                 print(f"Request has {len(chat_request.get('context', {}).get('files', []))} files...")
 
             # Call the real GitHub Copilot API
-            response = self._call_github_copilot_api(chat_request)
+            response = self._call_github_copilot_api(chat_request, on_content)
 
             # Add to session history
             self.session_history.append(
@@ -587,11 +1045,10 @@ class ChatInterface:
         # Get real workspace context if available
         workspace_context = {}
         if context and context.get("workspace"):
-            workspace_manager = WorkspaceContextManager(
-                Path(context["workspace"]), 
-                verbose=self.verbose
-            )
-            workspace_context = workspace_manager.get_workspace_context()
+            workspace_context = self._take_prefetched_context(context["workspace"])
+            if workspace_context is None:
+                workspace_manager = self._get_workspace_manager(context["workspace"])
+                workspace_context = workspace_manager.get_workspace_context()
 
         request = {
             "message": message,
@@ -612,11 +1069,16 @@ class ChatInterface:
 
         return request
 
-    def _call_github_copilot_api(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    def _call_github_copilot_api(
+        self,
+        request: Dict[str, Any],
+        on_content: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
         """Call the real GitHub Copilot API.
 
         Args:
             request: The chat request
+            on_content: Optional callback receiving streamed content chunks
 
         Returns:
             API response with real data analysis
@@ -638,12 +1100,26 @@ class ChatInterface:
         messages = self._build_messages(message, agent, context, workspace_context)
         
         # Make the real API call
-        response = self.api_client.send_chat_request(
-            messages=messages,
-            model=model,
-            temperature=config.get("temperature", 0.1),
-            max_tokens=config.get("max_tokens", 4096)
-        )
+        if on_content is None:
+            response = self.api_client.send_chat_request(
+                messages=messages,
+                model=model,
+                temperature=config.get("temperature", 0.1),
+                max_tokens=config.get("max_tokens", 4096)
+            )
+        else:
+            response = self.api_client.send_chat_request_stream(
+                messages=messages,
+                model=model,
+                temperature=config.get("temperature", 0.1),
+                max_tokens=config.get("max_tokens", 4096)
+            )
+            if response.get("success"):
+                chunks = []
+                for chunk in response.pop("stream"):
+                    on_content(chunk)
+                    chunks.append(chunk)
+                response["content"] = "".join(chunks)
         
         if response.get("success"):
             return {
@@ -676,21 +1152,7 @@ class ChatInterface:
         messages = []
         
         # System message based on agent
-        system_prompts = {
-            "workspace": """You are GitHub Copilot, an AI coding assistant. You help developers understand, write, and improve code. 
-You have access to the current workspace context and can provide insights about the codebase, suggest improvements, and answer coding questions.
-Be helpful, accurate, and concise in your responses.""",
-            
-            "terminal": """You are GitHub Copilot in terminal mode. You help with command-line operations, shell commands, and system administration tasks.
-You can analyze system information and suggest appropriate commands for the user's platform.
-Be practical and provide working command examples.""",
-            
-            "explain": """You are GitHub Copilot in explanation mode. You excel at explaining code, algorithms, and programming concepts.
-Break down complex topics into understandable parts and provide clear, educational explanations.
-Use examples and analogies when helpful."""
-        }
-        
-        system_message = system_prompts.get(agent, system_prompts["workspace"])
+        system_message = _SYSTEM_PROMPTS.get(agent, _SYSTEM_PROMPTS["workspace"])
         
         # Add workspace context to system message if available
         if workspace_context:
@@ -712,16 +1174,15 @@ Use examples and analogies when helpful."""
         # Add file context if provided
         files = context.get("files", [])
         if files:
-            file_context = "Files in context:\n"
+            parts = ["Files in context:\n"]
             for file_info in files[:3]:  # Limit to first 3 files
                 file_path = file_info.get("path", "unknown")
-                content = file_info.get("content", "")
-                preview = content[:1000] + "..." if len(content) > 1000 else content
-                file_context += f"\n--- {file_path} ---\n{preview}\n"
+                preview = self._get_file_preview(file_info)
+                parts.append(f"\n--- {file_path} ---\n{preview}\n")
             
             messages.append({
                 "role": "user", 
-                "content": file_context
+                "content": "".join(parts)
             })
         
         # Add the user's message
@@ -732,42 +1193,40 @@ Use examples and analogies when helpful."""
         
         return messages
 
+    def _get_file_preview(self, file_info: Dict[str, Any]) -> str:
+        """Get the truncated preview of a context file.
+
+        Prefers a preview computed at ingest, then in-memory content, and
+        finally reads at most MAX_PREVIEW characters from disk.
+        """
+        if "preview" in file_info:
+            return file_info["preview"]
+
+        content = file_info.get("content")
+        if content is not None:
+            return content[:MAX_PREVIEW] + "..." if len(content) > MAX_PREVIEW else content
+
+        full_path = file_info.get("full_path")
+        if full_path:
+            try:
+                return read_file_preview(full_path)
+            except (OSError, UnicodeDecodeError) as e:
+                if self.verbose:
+                    print(f"Could not read preview for {full_path}: {e}")
+        return ""
+
     def _extract_references(self, context: Dict[str, Any]) -> List[str]:
         """Extract file references from context."""
-        files = context.get("files", [])
-        return [f["path"] for f in files if "path" in f]
+        return list(self.iter_references(context))
+
+    def iter_references(self, context: Dict[str, Any]) -> Iterator[str]:
+        """Iterate over file references in context without building a list."""
+        return (f["path"] for f in context.get("files", ()) if "path" in f)
 
-    def _detect_language(self, file_path: Path) -> Optional[str]:
+    def _detect_language(self, file_path: Union[str, Path]) -> Optional[str]:
         """Detect programming language from file extension."""
-        suffix = file_path.suffix.lower()
-        
-        language_map = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.jsx': 'javascript',
-            '.tsx': 'typescript',
-            '.java': 'java',
-            '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp',
-            '.c': 'c',
-            '.h': 'c', '.hpp': 'cpp',
-            '.cs': 'csharp',
-            '.php': 'php',
-            '.rb': 'ruby',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.swift': 'swift',
-            '.kt': 'kotlin',
-            '.scala': 'scala',
-            '.md': 'markdown',
-            '.json': 'json',
-            '.yaml': 'yaml', '.yml': 'yaml',
-            '.xml': 'xml',
-            '.html': 'html',
-            '.css': 'css'
-        }
-        
-        return language_map.get(suffix)
+        suffix = os.path.splitext(file_path)[1].lower()
+        return _LANGUAGE_MAP.get(suffix)
 
     def get_session_history(self) -> List[Dict[str, Any]]:
         """Get the current session history.
@@ -775,7 +1234,15 @@ Use examples and analogies when helpful."""
         Returns:
             List of session messages
         """
-        return self.session_history.copy()
+        return list(self.session_history)
+
+    def iter_history(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the session history without copying it.
+
+        Returns:
+            Iterator over session messages, oldest first
+        """
+        return iter(self.session_history)
 
     def clear_session_history(self):
         """Clear the session history."""
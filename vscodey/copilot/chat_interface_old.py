@@ -2,16 +2,539 @@
 Chat interface for CLI Pilot - simulates GitHub Copilot Chat.
 """
 
+import hashlib
+import io
 import json
+import os
+import platform
+import re
+import sys
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple
+
+try:
+    import ijson
+except ImportError:
+    # Optional; large JSON files are parsed with json.loads instead
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    # Optional speedup; fall back to the standard library
+    orjson = None
 
 from .config import CLIConfig
 
 
+# Keyword classes used to route simulated responses. Each class compiles to a
+# single alternation so one search scans the message for every keyword. Stems
+# match at the start of a word so inflections still route ('fixing',
+# 'tests'); short ambiguous tokens ('hi', 'ls') only match as whole words;
+# multi-word phrases match anywhere.
+def _keyword_re(
+    stems: Iterable[str] = (),
+    phrases: Iterable[str] = (),
+    words: Iterable[str] = (),
+) -> Pattern[str]:
+    """Compile keyword stems, phrases and whole words into one alternation."""
+    alternatives = []
+    if stems:
+        alternatives.append(r"\b(?:%s)" % "|".join(map(re.escape, sorted(stems))))
+    if words:
+        alternatives.append(r"\b(?:%s)\b" % "|".join(map(re.escape, sorted(words))))
+    alternatives.extend(map(re.escape, phrases))
+    return re.compile("|".join(alternatives))
+
+
+_DIR_RE = _keyword_re(
+    phrases=(
+        "current working directory",
+        "current directory",
+        "where am i",
+        "current folder",
+        "working directory",
+        "current path",
+    ),
+    words={"pwd"},
+)
+_DIR_EXCLUDE_RE = _keyword_re(
+    {"list", "contents"}, ("show files",), words={"ls", "dir"}
+)
+
+_LIST_RE = _keyword_re(
+    phrases=(
+        "list files",
+        "show files",
+        "what files",
+        "file list",
+        "show me files",
+        "list the files",
+        "show directory contents",
+        "list directory contents",
+    ),
+    words={"ls", "dir"},
+)
+
+_FILE_TOOL_RE = _keyword_re(
+    {"filesystem"},
+    (
+        "read file",
+        "file content",
+        "open file",
+        "read main.py",
+        "show file",
+        "get file",
+        "file system",
+    ),
+)
+
+_EXPLAIN_RE = _keyword_re({"explain"}, ("what does", "how does"))
+_GREETING_RE = _keyword_re({"hello", "hey"}, words={"hi"})
+_CREATE_RE = _keyword_re({"create", "generate", "make", "build"})
+_FIX_RE = _keyword_re({"fix", "debug", "error", "bug"})
+_TEST_RE = _keyword_re({"test", "unittest", "pytest"})
+_REFACTOR_RE = _keyword_re({"refactor", "improv", "optimis", "optimiz"})
+
+
+# Patterns used by the issue detectors and file analyzers, compiled once
+# Per-line Python checks fused into one pass over the whole file; [^\S\n]
+# keeps each match on a single line
+_RE_PY_LINE_ISSUES = re.compile(
+    r'^[^\S\n]*(?:(?P<bare_except>except[^\S\n]*:)|(?P<print>print[^\S\n]*\())',
+    re.MULTILINE,
+)
+_RE_MIXED_INDENT = re.compile(r'^(?=[^\n]*\t)(?=[^\n]*    )', re.MULTILINE)
+_RE_LONG_LINE = re.compile(r'^[^\n]{101,}', re.MULTILINE)
+# Module usage and import substrings, found in one scan. The lookahead makes
+# matches zero-width so overlapping needles ('import json.') are all seen.
+_PY_IMPORT_NEEDLES = ('json.', 'import json', 'os.', 'import os', 're.', 'import re')
+_RE_PY_IMPORT_NEEDLES = re.compile(
+    '(?=(%s))' % '|'.join(map(re.escape, _PY_IMPORT_NEEDLES))
+)
+_RE_IF_BLOCK = re.compile(r'\bif\s+.*:')
+_RE_ELSE = re.compile(r'\belse\s*:')
+_RE_DEF = re.compile(r'^\s*def\s+(\w+)', re.MULTILINE)
+_RE_CLASS = re.compile(r'^\s*class\s+(\w+)', re.MULTILINE)
+# Complexity markers counted in one pass. A decorator only consumes its '@'
+# so a keyword right after it ('@if ...') is still counted on its own.
+_RE_PY_COMPLEXITY = re.compile(
+    r'(?P<try_except>\btry\s*:)'
+    r'|(?P<if_statements>\bif\s+)'
+    r'|(?P<loops>\b(?:for|while)\s+)'
+    r'|(?P<decorators>@(?=\w))'
+)
+
+_JS_STATEMENT_PREFIXES = ('var', 'let', 'const', 'function', 'return')
+_RE_JS_VAR = re.compile(r'\b(var|let|const)\s+(\w+)')
+_RE_JS_FN = re.compile(r'function\s+(\w+)')
+_RE_JS_CALL = re.compile(r'\b(\w+)\s*\(')
+# Globals and keywords that look like calls ('if (') but are never undefined
+_JS_KNOWN_CALLABLES = frozenset({
+    'console', 'document', 'window', 'require', 'module', 'exports',
+    'if', 'for', 'while', 'switch', 'catch', 'return', 'function', 'typeof',
+})
+_RE_JS_IMPORT = re.compile(r'^\s*(import|require)', re.MULTILINE)
+_RE_JS_FUNCTION = re.compile(r'(function\s+\w+|const\s+\w+\s*=\s*\(|let\s+\w+\s*=\s*\(|var\s+\w+\s*=\s*\()')
+_RE_JS_ASYNC = re.compile(r'\basync\s+(function|\w+)')
+
+_RE_MD_HEADER = re.compile(r'^#+\s+', re.MULTILINE)
+_RE_MD_HEADER_LEVEL = re.compile(r'^(#+)\s+(.*)', re.MULTILINE)
+_RE_MD_LINK = re.compile(r'\[.*?\]\(.*?\)')
+_RE_MD_IMAGE = re.compile(r'!\[.*?\]\(.*?\)')
+_RE_MD_LIST = re.compile(r'^\s*[-*+]\s+', re.MULTILINE)
+
+
+# JSON files larger than this are summarized by streaming instead of
+# building the whole object tree. Streaming trades time for memory: even the
+# C backends are a little slower than json.loads, but peak memory stays flat.
+# The pure-Python backend is an order of magnitude slower, so it is not used.
+_JSON_STREAM_THRESHOLD = 1 << 20
+_IJSON_C_BACKENDS = frozenset({'yajl2_c', 'yajl2_cffi'})
+_RE_JSON_CONTAINER = re.compile(r'[ \t\n\r]*[\[{]')
+
+
+def _can_stream_json(content: str) -> bool:
+    """Check whether content is large enough, and shaped right, to stream."""
+    return (
+        ijson is not None
+        and ijson.backend in _IJSON_C_BACKENDS
+        and len(content) > _JSON_STREAM_THRESHOLD
+        and _RE_JSON_CONTAINER.match(content) is not None
+    )
+
+
+def _iter_json_events(content: str) -> Iterator[Tuple[str, str, Any]]:
+    """Return ijson parse events for a JSON document held in a string."""
+    return ijson.parse(io.BytesIO(content.encode('utf-8')))
+
+
+def _stream_json_is_valid(content: str) -> bool:
+    """Check a large JSON document by streaming it; False if not checked or invalid."""
+    if not _can_stream_json(content):
+        return False
+    try:
+        for _ in _iter_json_events(content):
+            pass
+    except Exception:
+        return False
+    return True
+
+
+def _discard_object(pairs: List[Tuple[str, Any]]) -> None:
+    """object_pairs_hook that drops each parsed object instead of building a dict."""
+    return None
+
+
+def _check_json(content: str) -> None:
+    """Raise json.JSONDecodeError if content is not valid JSON.
+
+    orjson is tried first when installed; on failure the standard library
+    re-parses so the error message and location are the usual ones.
+    """
+    if orjson is not None:
+        try:
+            orjson.loads(content)
+            return
+        except orjson.JSONDecodeError:
+            pass
+    json.loads(content, object_pairs_hook=_discard_object)
+
+
+def _stream_json_summary(content: str) -> Tuple[str, List[str], int]:
+    """Summarize a top-level JSON object or array without materializing it.
+
+    Returns:
+        Structure type, the top-level keys shown in the analysis and the
+        nested item count. These match the parsed-tree path except that
+        duplicate keys are counted each time they appear.
+    """
+    total_items = 0
+    top_keys: Dict[str, None] = {}
+    top_length = 0
+    # Container type for each open level; array members count as items
+    stack: List[str] = []
+    for _, event, value in _iter_json_events(content):
+        if event in ('end_map', 'end_array'):
+            stack.pop()
+            continue
+        if stack == ['array']:
+            top_length += 1
+        if event == 'map_key':
+            total_items += 1
+            if len(stack) == 1 and len(top_keys) < 5:
+                top_keys[value] = None
+            continue
+        if stack and stack[-1] == 'array':
+            total_items += 1
+        if event == 'start_map':
+            stack.append('map')
+        elif event == 'start_array':
+            stack.append('array')
+        else:
+            total_items += 1
+
+    if _RE_JSON_CONTAINER.match(content).group().endswith('{'):
+        return "Object", list(top_keys), total_items
+    return "Array", [f"Array[{top_length}]"], total_items
+
+
+def _content_key(content: str) -> Tuple[int, bytes]:
+    """Identify file content by length and digest, so caches don't keep the text alive."""
+    digest = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16)
+    return len(content), digest.digest()
+
+
+def _iter_lines(content: str) -> Iterator[str]:
+    r"""Yield the same lines as content.split('\n') without building a list."""
+    start = 0
+    while True:
+        end = content.find('\n', start)
+        if end < 0:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
+
+
+def _iter_line_matches(pattern: Pattern[str], content: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, match) for each match of a MULTILINE pattern."""
+    line_no, last = 1, 0
+    for match in pattern.finditer(content):
+        line_no += content.count('\n', last, match.start())
+        last = match.start()
+        yield line_no, match
+
+
+_NO_SYNTAX_ISSUES = "• No obvious syntax issues detected"
+_NO_QUALITY_ISSUES = "• Code quality looks reasonable"
+
+# Issue lists stop at this many entries; nobody reads past it and
+# pathological files would otherwise flag every line
+_MAX_ISSUES = 20
+
+
+def _bullet_list(items: List[str], empty: str) -> str:
+    """Render items as '• ' bullet lines, or return ``empty`` if there are none.
+
+    Lists longer than ``_MAX_ISSUES`` are cut short with a truncation marker.
+    """
+    if not items:
+        return empty
+    if len(items) > _MAX_ISSUES:
+        items = items[:_MAX_ISSUES] + ["... (truncated)"]
+    return "• " + "\n• ".join(items)
+
+
+# Shared, immutable reference list for replies that cite no files
+_EMPTY_REFS: Tuple[str, ...] = ()
+
+
+# Canned per-model replies, filled in with str.format_map
+_CLAUDE_TEMPLATE = """Hello! I'm {model_name}, working as your {agent_intro}.
+
+**Your message:** {message}
+
+I notice you're using Claude, which excels at:
+• Deep code analysis and understanding
+• Structured problem-solving approaches
+• Clear explanations with step-by-step reasoning
+• Following coding best practices
+
+**As your {agent} agent, I specialize in:**
+{caps}
+
+**Claude's capabilities:**
+✓ Advanced code understanding and generation
+✓ Excellent at refactoring and code review
+✓ Strong analytical and reasoning abilities
+✓ Tool use and function calling support
+
+How can I assist you with your code today? I can help explain complex logic, suggest improvements, or generate new functionality."""
+
+_GEMINI_TEMPLATE = """Hi there! I'm {model_name}, working as your {agent_intro}.
+
+**Your query:** {message}
+
+As Gemini, I bring:
+• Fast and efficient processing
+• Multi-modal understanding capabilities
+• Strong reasoning and problem-solving
+• Integration with Google's latest AI research
+
+**As your {agent} agent, I focus on:**
+{caps}
+
+**Gemini's strengths:**
+🚀 High-speed responses
+🔍 Comprehensive code analysis
+🌟 Creative problem-solving approaches
+⚡ Efficient token usage
+
+Let me know what coding challenge you're working on, and I'll provide detailed, actionable guidance!"""
+
+_O1_TEMPLATE = """I am {model_name}, working as your {agent_intro}. Let me think through your request carefully.
+
+**Your request:** {message}
+
+<thinking>
+I need to analyze this request step by step:
+1. Understanding the user's intent from a {agent} perspective
+2. Considering the context and constraints specific to {agent} tasks
+3. Formulating a comprehensive response that leverages my {agent} capabilities
+4. Ensuring accuracy and completeness in my specialized domain
+</thinking>
+
+**My analysis as {agent} agent:**
+{caps}
+
+**O1 Model Characteristics:**
+🧠 Advanced reasoning capabilities
+🔬 Step-by-step problem analysis
+📊 Strong performance on complex tasks
+💡 Thoughtful, deliberate responses
+
+For your coding needs, I can provide in-depth analysis, algorithm design, debugging strategies, and architectural recommendations. What specific challenge would you like me to reason through?"""
+
+_GREETING_CAPABILITIES = """
+
+I can help you with:
+• Code explanation and documentation
+• Creating new functions and classes
+• Debugging and fixing issues
+• Writing tests
+• Code refactoring and optimization
+• General programming questions
+
+What would you like to work on today?"""
+
+
+# Static bodies of the test and refactor replies; only their headers vary
+_PY_TEST_TEMPLATE = """
+**Python Testing Options:**
+• `unittest` (built-in)
+• `pytest` (popular third-party)
+• `doctest` (for documentation examples)
+
+**Example Test Structure:**
+```python
+import unittest
+from your_module import your_function
+
+class TestYourFunction(unittest.TestCase):
+    def test_basic_functionality(self):
+        result = your_function(input_value)
+        self.assertEqual(result, expected_value)
+
+    def test_edge_cases(self):
+        # Test edge cases here
+        pass
+
+if __name__ == '__main__':
+    unittest.main()
+```"""
+
+_JS_TEST_TEMPLATE = """
+**JavaScript Testing Options:**
+• Jest (popular choice)
+• Mocha + Chai
+• Jasmine
+
+**Example Jest Test:**
+```javascript
+const yourFunction = require('./your-module');
+
+describe('Your Function', () => {
+    test('should return expected value', () => {
+        const result = yourFunction(inputValue);
+        expect(result).toBe(expectedValue);
+    });
+
+    test('should handle edge cases', () => {
+        // Test edge cases here
+    });
+});
+```"""
+
+_PY_REFACTOR_TIPS = """• Extract long functions into smaller ones
+• Use list/dict comprehensions where appropriate
+• Apply PEP 8 style guidelines
+• Remove code duplication
+• Improve variable and function names
+• Add type hints for better clarity
+• Optimize imports and dependencies"""
+
+_JS_REFACTOR_TIPS = """• Convert to modern ES6+ syntax
+• Extract reusable components/functions
+• Improve async/await usage
+• Optimize DOM manipulations
+• Remove unused variables and functions
+• Improve error handling
+• Apply consistent naming conventions"""
+
+
+# File extension -> language name used by the analysis helpers. Keys and
+# values are interned so lookups and language comparisons hit shared objects.
+_EXTENSION_LANGUAGES = MappingProxyType({
+    sys.intern(extension): sys.intern(language)
+    for extension, language in {
+        '.py': 'python',
+        '.js': 'javascript',
+        '.ts': 'typescript',
+        '.jsx': 'jsx',
+        '.tsx': 'tsx',
+        '.java': 'java',
+        '.c': 'c',
+        '.cpp': 'cpp',
+        '.h': 'c',
+        '.hpp': 'cpp',
+        '.cs': 'csharp',
+        '.go': 'go',
+        '.rs': 'rust',
+        '.php': 'php',
+        '.rb': 'ruby',
+        '.swift': 'swift',
+        '.kt': 'kotlin',
+        '.html': 'html',
+        '.css': 'css',
+        '.scss': 'scss',
+        '.sass': 'sass',
+        '.json': 'json',
+        '.xml': 'xml',
+        '.yaml': 'yaml',
+        '.yml': 'yaml',
+        '.md': 'markdown',
+        '.sql': 'sql',
+        '.sh': 'bash',
+        '.bat': 'batch',
+        '.ps1': 'powershell',
+    }.items()
+})
+
+# Capability blurbs shared by every templated reply for an agent
+_CAPS_WORKSPACE = sys.intern("""• Project structure analysis
+• Cross-file code understanding
+• Workspace configuration management
+• Dependency analysis""")
+_CAPS_VSCODE = sys.intern("""• Editor features and shortcuts
+• Extension recommendations
+• Debugging assistance
+• Settings and configuration""")
+_CAPS_TERMINAL = sys.intern("""• Shell command generation
+• Script automation
+• Process management
+• Command-line tool integration""")
+_CAPS_AGENT = sys.intern("""• Autonomous task planning
+• Multi-step execution
+• Tool calling and integration
+• MCP server utilization""")
+
+
 class ChatInterface:
     """Interface for chat functionality, simulating GitHub Copilot Chat."""
 
+    # Per-agent blurbs used by every style response; built once at import
+    _AGENT_INTROS = MappingProxyType({
+        "workspace": "Workspace Agent, specializing in project-wide analysis",
+        "vscode": "VS Code Agent, expert in editor features and extensions",
+        "terminal": "Terminal Agent, focused on command-line operations",
+        "agent": "Autonomous Agent, capable of multi-step task execution",
+    })
+
+    _AGENT_CAPS = MappingProxyType({
+        "workspace": _CAPS_WORKSPACE,
+        "vscode": _CAPS_VSCODE,
+        "terminal": _CAPS_TERMINAL,
+        "agent": _CAPS_AGENT,
+    })
+
+    # Explanations and issue reports for recently seen files are reused
+    # across turns
+    _ANALYSIS_CACHE_SIZE = 128
+
+    # Language -> method name for the per-language issue detectors and
+    # content analyzers
+    _ISSUE_DETECTORS = MappingProxyType({
+        'python': '_detect_python_issues',
+        'javascript': '_detect_javascript_issues',
+        'typescript': '_detect_javascript_issues',
+        'json': '_detect_json_issues',
+    })
+    _CONTENT_ANALYZERS = MappingProxyType({
+        'python': '_analyze_python_content',
+        'javascript': '_analyze_javascript_content',
+        'typescript': '_analyze_javascript_content',
+        'json': '_analyze_json_content',
+        'markdown': '_analyze_markdown_content',
+    })
+
+    # Flip once _call_github_copilot_api talks to the real service
+    _API_IMPLEMENTED = False
+
     def __init__(self, config: CLIConfig, verbose: bool = False):
         """Initialize chat interface.
 
@@ -21,7 +544,13 @@ class ChatInterface:
         """
         self.config = config
         self.verbose = verbose
-        self.session_history = []
+        self.session_history = deque(maxlen=self.config.get("chat.history_max", 2000))
+        # (kind, file_path, language, content key) -> report, least recently
+        # used first; see _content_key
+        self._analysis_cache: "OrderedDict[Tuple[str, str, str, Tuple[int, bytes]], Dict[str, str]]" = OrderedDict()
+        # (content key, function names, docstring count) of the last Python
+        # file scanned, shared by the issue detector and the structure analysis
+        self._last_python_outline: Optional[Tuple[Tuple[int, bytes], Tuple[str, ...], int]] = None
 
     def send_message(
         self,
@@ -49,17 +578,25 @@ class ChatInterface:
                         "  vscodey-copilot setup --token <your-token>"
             }
 
+        # One timestamp for the request and its history entries
+        now = time.time()
+
         try:
-            # Prepare the request
-            chat_request = self._prepare_request(message, context, agent, model)
-
-            if self.verbose:
-                used_model = chat_request.get("model", "default")
-                print(f"Sending chat request using model: {used_model}")
-                print(
-                    f"Request has {len(chat_request.get('context', {}).get('files', []))} files..."
+            # The stub API ignores the request, so only resolve models and
+            # build the payload once a real client is wired in
+            if self._API_IMPLEMENTED:
+                chat_request = self._prepare_request(
+                    message, context, agent, model, timestamp=now
                 )
 
+                if self.verbose:
+                    used_model = chat_request.get("model", "default")
+                    print(f"Sending chat request using model: {used_model}")
+                    print(f"Request has {chat_request['files_count']} files...")
+            else:
+                # History still records the model the request would use
+                chat_request = {"model": self._resolve_model(model)[0]}
+
             # TODO: Connect to actual GitHub Copilot API
             # This is where the real API integration would go
             response = self._call_github_copilot_api(chat_request)
@@ -71,7 +608,7 @@ class ChatInterface:
                     "message": message,
                     "context": context,
                     "model": chat_request.get("model"),
-                    "timestamp": time.time(),
+                    "timestamp": now,
                 }
             )
 
@@ -79,7 +616,7 @@ class ChatInterface:
                 {
                     "type": "response",
                     "content": response.get("content", ""),
-                    "timestamp": time.time(),
+                    "timestamp": now,
                 }
             )
 
@@ -88,12 +625,32 @@ class ChatInterface:
         except Exception as e:
             return {"error": f"Failed to send message: {str(e)}"}
 
+    def _resolve_model(self, model: Optional[str]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Pick the model a request uses and look up its info.
+
+        Args:
+            model: Requested model, or None for the configured default
+
+        Returns:
+            Model ID (the default if the requested one is unknown) and its info
+        """
+        selected_model = model if model else self.config.get_default_model()
+        model_info = self.config.get_model_info(selected_model)
+
+        if not model_info:
+            # Fallback to default if model not found
+            selected_model = self.config.get_default_model()
+            model_info = self.config.get_model_info(selected_model)
+
+        return selected_model, model_info
+
     def _prepare_request(
         self,
         message: str,
         context: Dict[str, Any] = None,
         agent: Optional[str] = None,
         model: Optional[str] = None,
+        timestamp: Optional[float] = None,
     ) -> Dict[str, Any]:
         """Prepare the chat request.
 
@@ -102,29 +659,25 @@ class ChatInterface:
             context: Context information
             agent: Specific agent to use
             model: Specific model to use
+            timestamp: Request time; defaults to now
 
         Returns:
             Prepared request dictionary
         """
         chat_config = self.config.get_chat_config()
 
-        # Determine which model to use
-        selected_model = model if model else self.config.get_default_model()
-        model_info = self.config.get_model_info(selected_model)
-
-        if not model_info:
-            # Fallback to default if model not found
-            selected_model = self.config.get_default_model()
-            model_info = self.config.get_model_info(selected_model)
+        selected_model, model_info = self._resolve_model(model)
 
+        context = context or {}
         request = {
             "message": message,
             "agent": agent or chat_config.get("default_agent", "workspace"),
             "model": selected_model,
             "model_info": model_info,
-            "context": context or {},
+            "context": context,
+            "files_count": len(context.get("files") or ()),
             "session_id": "cli_session",
-            "timestamp": time.time(),
+            "timestamp": time.time() if timestamp is None else timestamp,
             "config": {
                 "temperature": chat_config.get("temperature", 0.1),
                 "max_tokens": model_info.get("max_tokens", 4096)
@@ -166,7 +719,7 @@ class ChatInterface:
         Returns:
             List of session messages
         """
-        return self.session_history.copy()
+        return list(self.session_history)
 
     def clear_session_history(self):
         """Clear the session history."""
@@ -194,63 +747,23 @@ class ChatInterface:
                 message, context, model_info, model_name
             )
 
-        # Agent-specific introduction
-        agent_intro = self._get_agent_introduction(agent)
-
-        content = f"""Hello! I'm {model_name}, working as your {agent_intro}.
-
-**Your message:** {message}
-
-I notice you're using Claude, which excels at:
-• Deep code analysis and understanding
-• Structured problem-solving approaches
-• Clear explanations with step-by-step reasoning
-• Following coding best practices
-
-**As your {agent} agent, I specialize in:**
-{self._get_agent_capabilities_text(agent)}
-
-**Claude's capabilities:**
-✓ Advanced code understanding and generation
-✓ Excellent at refactoring and code review
-✓ Strong analytical and reasoning abilities
-✓ Tool use and function calling support
-
-How can I assist you with your code today? I can help explain complex logic, suggest improvements, or generate new functionality."""
+        content = _CLAUDE_TEMPLATE.format_map({
+            "model_name": model_name,
+            "agent": agent,
+            "agent_intro": self._get_agent_introduction(agent),
+            "caps": self._get_agent_capabilities_text(agent),
+            "message": message,
+        })
 
-        return {"content": content, "references": []}
+        return {"content": content, "references": _EMPTY_REFS}
 
     def _get_agent_introduction(self, agent: str) -> str:
         """Get agent-specific introduction text."""
-        agent_intros = {
-            "workspace": "Workspace Agent, specializing in project-wide analysis",
-            "vscode": "VS Code Agent, expert in editor features and extensions",
-            "terminal": "Terminal Agent, focused on command-line operations",
-            "agent": "Autonomous Agent, capable of multi-step task execution",
-        }
-        return agent_intros.get(agent, "AI Assistant")
+        return self._AGENT_INTROS.get(agent, "AI Assistant")
 
     def _get_agent_capabilities_text(self, agent: str) -> str:
         """Get formatted agent capabilities text."""
-        agent_caps = {
-            "workspace": """• Project structure analysis
-• Cross-file code understanding
-• Workspace configuration management
-• Dependency analysis""",
-            "vscode": """• Editor features and shortcuts
-• Extension recommendations
-• Debugging assistance
-• Settings and configuration""",
-            "terminal": """• Shell command generation
-• Script automation
-• Process management
-• Command-line tool integration""",
-            "agent": """• Autonomous task planning
-• Multi-step execution
-• Tool calling and integration
-• MCP server utilization""",
-        }
-        return agent_caps.get(agent, "• General coding assistance")
+        return self._AGENT_CAPS.get(agent, "• General coding assistance")
 
     def _generate_terminal_specific_response(
         self,
@@ -260,26 +773,11 @@ How can I assist you with your code today? I can help explain complex logic, sug
         model_name: str,
     ) -> Dict[str, Any]:
         """Generate terminal agent specific responses with actual command execution."""
-        import os
-        import platform
-
-        message_lower = message.lower()
+        message_lower = message.casefold()
 
         # Detect directory-only requests FIRST (most specific)
-        if any(
-            phrase in message_lower
-            for phrase in [
-                "current working directory",
-                "current directory",
-                "where am i",
-                "pwd",
-                "current folder",
-                "working directory",
-                "current path",
-            ]
-        ) and not any(
-            list_phrase in message_lower
-            for list_phrase in ["list", "show files", "contents", "ls", "dir"]
+        if _DIR_RE.search(message_lower) and not _DIR_EXCLUDE_RE.search(
+            message_lower
         ):
             current_dir = os.getcwd()
             content = f"""🖥️ **{model_name} - Terminal Agent**
@@ -313,34 +811,26 @@ I'll help you find the current working directory!
 
 Would you like me to help with any other directory operations?"""
 
-            return {"content": content, "references": []}
+            return {"content": content, "references": _EMPTY_REFS}
 
         # Detect list files/directory contents requests SECOND
-        elif any(
-            phrase in message_lower
-            for phrase in [
-                "list files",
-                "show files",
-                "what files",
-                "ls",
-                "dir",
-                "file list",
-                "show me files",
-                "list the files",
-                "show directory contents",
-                "list directory contents",
-            ]
-        ):
+        elif _LIST_RE.search(message_lower):
             try:
                 current_dir = os.getcwd()
                 files_and_dirs = []
-
-                for item in sorted(os.listdir(current_dir)):
-                    item_path = os.path.join(current_dir, item)
-                    if os.path.isdir(item_path):
-                        files_and_dirs.append(f"📁 {item}/")
-                    else:
-                        files_and_dirs.append(f"📄 {item}")
+                dir_count = file_count = 0
+
+                # One directory read; DirEntry answers is_dir/is_file from
+                # the listing without a stat per item
+                with os.scandir(current_dir) as entries:
+                    for entry in sorted(entries, key=lambda e: e.name):
+                        if entry.is_dir():
+                            dir_count += 1
+                            files_and_dirs.append(f"📁 {entry.name}/")
+                        else:
+                            if entry.is_file():
+                                file_count += 1
+                            files_and_dirs.append(f"📄 {entry.name}")
 
                 files_list = "\n".join(files_and_dirs[:20])  # Limit to first 20 items
 
@@ -355,14 +845,14 @@ Would you like me to help with any other directory operations?"""
 {f"... and {len(files_and_dirs) - 20} more items" if len(files_and_dirs) > 20 else ""}
 ```
 
-**Total items:** {len(files_and_dirs)} ({sum(1 for item in os.listdir(current_dir) if os.path.isdir(os.path.join(current_dir, item)))} folders, {sum(1 for item in os.listdir(current_dir) if os.path.isfile(os.path.join(current_dir, item)))} files)
+**Total items:** {len(files_and_dirs)} ({dir_count} folders, {file_count} files)
 
 **Commands to explore further:**
 • `Get-ChildItem -Recurse` (PowerShell) - List all files recursively
 • `Get-ChildItem | Where-Object {{$_.PSIsContainer}}` - Show only folders
 • `Get-ChildItem | Where-Object {{!$_.PSIsContainer}}` - Show only files"""
 
-                return {"content": content, "references": []}
+                return {"content": content, "references": _EMPTY_REFS}
 
             except Exception as e:
                 content = f"""🖥️ **{model_name} - Terminal Agent**
@@ -376,7 +866,7 @@ Would you like me to help with any other directory operations?"""
 • `dir` (Command Prompt)
 • `ls` (if using WSL or Git Bash)"""
 
-                return {"content": content, "references": []}
+                return {"content": content, "references": _EMPTY_REFS}
 
         # Handle other terminal-related requests with command suggestions
         else:
@@ -411,7 +901,7 @@ Platform: {platform.system()}
 
 What specific terminal task would you like help with?"""
 
-            return {"content": content, "references": []}
+            return {"content": content, "references": _EMPTY_REFS}
 
     def _generate_agent_mode_response(
         self,
@@ -421,24 +911,10 @@ What specific terminal task would you like help with?"""
         model_name: str,
     ) -> Dict[str, Any]:
         """Generate agent mode responses with actual tool execution."""
-        import os
-
-        message_lower = message.lower()
+        message_lower = message.casefold()
 
         # Detect filesystem-related requests and execute them
-        if any(
-            phrase in message_lower
-            for phrase in [
-                "read file",
-                "filesystem",
-                "file content",
-                "open file",
-                "read main.py",
-                "show file",
-                "get file",
-                "file system",
-            ]
-        ):
+        if _FILE_TOOL_RE.search(message_lower):
             # Extract filename from the message
             filename = None
             if "main.py" in message_lower:
@@ -448,18 +924,49 @@ What specific terminal task would you like help with?"""
             elif "package.json" in message_lower:
                 filename = "package.json"
 
-            if filename and os.path.exists(filename):
+            # Open directly instead of probing with os.path.exists first:
+            # one syscall fewer and no window for the file to vanish between
+            # the check and the read. A missing file falls through to the
+            # directory listing below.
+            file_content = None
+            if filename:
                 try:
                     with open(filename, "r", encoding="utf-8") as f:
-                        file_content = f.read()
+                        file_size = os.fstat(f.fileno()).st_size
+                        # Only the first 2000 characters are shown, so one
+                        # extra is enough to tell whether to truncate
+                        file_content = f.read(2001)
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    content = f"""🤖 **{model_name} - Autonomous Agent**
 
-                    # Truncate if too long
-                    if len(file_content) > 2000:
-                        file_content = (
-                            file_content[:2000] + "\n... (truncated for display)"
-                        )
+**Your request:** {message}
 
-                    content = f"""🤖 **{model_name} - Autonomous Agent**
+**❌ Tool Execution: Filesystem Read Failed**
+
+I attempted to use the **filesystem MCP tool** but encountered an error:
+
+**File:** `{filename}`
+**Error:** {str(e)}
+
+**🔧 Available MCP Tools:**
+• **Filesystem Server** - File operations
+• **GitHub Server** - Repository operations
+• **Brave Search** - Web search capabilities
+
+Let me help you with an alternative approach or another task."""
+
+                    return {"content": content, "references": _EMPTY_REFS}
+
+            if file_content is not None:
+                # Truncate if too long
+                if len(file_content) > 2000:
+                    file_content = (
+                        file_content[:2000] + "\n... (truncated for display)"
+                    )
+
+                content = f"""🤖 **{model_name} - Autonomous Agent**
 
 **Your request:** {message}
 
@@ -469,7 +976,7 @@ I've successfully used the **filesystem MCP tool** to read the requested file:
 
 **File:** `{filename}`
 **Status:** ✅ Successfully read
-**Size:** {len(file_content)} characters
+**Size:** {file_size} bytes
 
 **Content:**
 ```
@@ -489,32 +996,13 @@ I've successfully used the **filesystem MCP tool** to read the requested file:
 
 What would you like me to do with this file content?"""
 
-                    return {"content": content, "references": [filename]}
-
-                except Exception as e:
-                    content = f"""🤖 **{model_name} - Autonomous Agent**
-
-**Your request:** {message}
-
-**❌ Tool Execution: Filesystem Read Failed**
-
-I attempted to use the **filesystem MCP tool** but encountered an error:
-
-**File:** `{filename}`
-**Error:** {str(e)}
-
-**🔧 Available MCP Tools:**
-• **Filesystem Server** - File operations
-• **GitHub Server** - Repository operations
-• **Brave Search** - Web search capabilities
-
-Let me help you with an alternative approach or another task."""
-
-                    return {"content": content, "references": []}
+                return {"content": content, "references": [filename]}
             else:
                 # File not found or not specified
                 current_dir = os.getcwd()
-                files = [f for f in os.listdir(current_dir) if os.path.isfile(f)]
+                with os.scandir(current_dir) as entries:
+                    files = [entry.name for entry in entries if entry.is_file()]
+                file_bullets = "\n".join(f"• {f}" for f in files[:10])
 
                 content = f"""🤖 **{model_name} - Autonomous Agent**
 
@@ -528,7 +1016,7 @@ I've used the **filesystem MCP tool** to analyze the current directory:
 **Available Files:** {len(files)} files found
 
 **Key Files I can read:**
-{chr(10).join([f"• {f}" for f in files[:10]])}
+{file_bullets}
 {f"... and {len(files) - 10} more files" if len(files) > 10 else ""}
 
 **🔧 MCP Tools Available:**
@@ -543,12 +1031,17 @@ I've used the **filesystem MCP tool** to analyze the current directory:
 
 Which file would you like me to read and analyze?"""
 
-                return {"content": content, "references": []}
+                return {"content": content, "references": _EMPTY_REFS}
 
         # Handle other agent mode requests
         else:
-            enabled_servers = self.config.get_enabled_mcp_servers()
-            server_count = len(enabled_servers)
+            # The bullets are all that's needed, so skip the intermediate dict
+            server_lines = [
+                f"• **{info.get('name', sid)}** - {info.get('description', 'Available')}"
+                for sid, info in self.config.iter_enabled_mcp_servers()
+            ]
+            server_count = len(server_lines)
+            server_bullets = "\n".join(server_lines)
 
             content = f"""🤖 **{model_name} - Autonomous Agent**
 
@@ -557,7 +1050,7 @@ Which file would you like me to read and analyze?"""
 **🚀 Agent Mode Active** - Multi-step task execution ready!
 
 **🔧 Available MCP Tools ({server_count} servers enabled):**
-{chr(10).join([f"• **{info.get('name', sid)}** - {info.get('description', 'Available')}" for sid, info in enabled_servers.items()])}
+{server_bullets}
 
 **💡 Autonomous Capabilities:**
 • **File Operations** - Read, write, analyze files
@@ -573,7 +1066,7 @@ Which file would you like me to read and analyze?"""
 
 **Ready for multi-step execution!** What task shall I tackle for you?"""
 
-            return {"content": content, "references": []}
+            return {"content": content, "references": _EMPTY_REFS}
 
     def _generate_gemini_style_response(
         self,
@@ -597,30 +1090,15 @@ Which file would you like me to read and analyze?"""
                 message, context, model_info, model_name
             )
 
-        agent_intro = self._get_agent_introduction(agent)
-
-        content = f"""Hi there! I'm {model_name}, working as your {agent_intro}.
-
-**Your query:** {message}
-
-As Gemini, I bring:
-• Fast and efficient processing
-• Multi-modal understanding capabilities
-• Strong reasoning and problem-solving
-• Integration with Google's latest AI research
-
-**As your {agent} agent, I focus on:**
-{self._get_agent_capabilities_text(agent)}
-
-**Gemini's strengths:**
-🚀 High-speed responses
-🔍 Comprehensive code analysis
-🌟 Creative problem-solving approaches
-⚡ Efficient token usage
-
-Let me know what coding challenge you're working on, and I'll provide detailed, actionable guidance!"""
+        content = _GEMINI_TEMPLATE.format_map({
+            "model_name": model_name,
+            "agent": agent,
+            "agent_intro": self._get_agent_introduction(agent),
+            "caps": self._get_agent_capabilities_text(agent),
+            "message": message,
+        })
 
-        return {"content": content, "references": []}
+        return {"content": content, "references": _EMPTY_REFS}
 
     def _generate_o1_style_response(
         self,
@@ -644,32 +1122,15 @@ Let me know what coding challenge you're working on, and I'll provide detailed,
                 message, context, model_info, model_name
             )
 
-        agent_intro = self._get_agent_introduction(agent)
-
-        content = f"""I am {model_name}, working as your {agent_intro}. Let me think through your request carefully.
-
-**Your request:** {message}
-
-<thinking>
-I need to analyze this request step by step:
-1. Understanding the user's intent from a {agent} perspective
-2. Considering the context and constraints specific to {agent} tasks
-3. Formulating a comprehensive response that leverages my {agent} capabilities
-4. Ensuring accuracy and completeness in my specialized domain
-</thinking>
-
-**My analysis as {agent} agent:**
-{self._get_agent_capabilities_text(agent)}
-
-**O1 Model Characteristics:**
-🧠 Advanced reasoning capabilities
-🔬 Step-by-step problem analysis
-📊 Strong performance on complex tasks
-💡 Thoughtful, deliberate responses
-
-For your coding needs, I can provide in-depth analysis, algorithm design, debugging strategies, and architectural recommendations. What specific challenge would you like me to reason through?"""
+        content = _O1_TEMPLATE.format_map({
+            "model_name": model_name,
+            "agent": agent,
+            "agent_intro": self._get_agent_introduction(agent),
+            "caps": self._get_agent_capabilities_text(agent),
+            "message": message,
+        })
 
-        return {"content": content, "references": []}
+        return {"content": content, "references": _EMPTY_REFS}
 
     def _generate_gpt_style_response(
         self,
@@ -695,50 +1156,31 @@ For your coding needs, I can provide in-depth analysis, algorithm design, debugg
                 message, context, model_info, model_name
             )
 
-        # Use existing response logic but with model awareness
-        if any(word in message for word in ["explain", "what does", "how does"]):
+        # Use existing response logic but with model awareness; keywords are
+        # matched case-insensitively like the terminal and agent dispatchers
+        message_cf = message.casefold()
+
+        if _EXPLAIN_RE.search(message_cf):
             return self._generate_explanation_response(files, message, model_name)
 
-        elif any(word in message for word in ["hello", "hi", "hey"]):
+        elif _GREETING_RE.search(message_cf):
             return self._generate_greeting_response(context, model_name)
 
-        elif any(word in message for word in ["create", "generate", "make", "build"]):
+        elif _CREATE_RE.search(message_cf):
             return self._generate_creation_response(message, workspace_info, model_name)
 
-        elif any(word in message for word in ["fix", "debug", "error", "bug"]):
+        elif _FIX_RE.search(message_cf):
             return self._generate_fix_response(files, message, model_name)
 
-        elif any(word in message for word in ["test", "testing", "unittest"]):
+        elif _TEST_RE.search(message_cf):
             return self._generate_test_response(files, workspace_info, model_name)
 
-        elif any(word in message for word in ["refactor", "improve", "optimize"]):
+        elif _REFACTOR_RE.search(message_cf):
             return self._generate_refactor_response(files, message, model_name)
 
         else:
             return self._generate_general_response(message, context, model_name)
 
-        # Simulate different types of responses based on the message
-        if any(word in message for word in ["explain", "what does", "how does"]):
-            return self._generate_explanation_response(files, message)
-
-        elif any(word in message for word in ["hello", "hi", "hey"]):
-            return self._generate_greeting_response(context)
-
-        elif any(word in message for word in ["create", "generate", "make", "build"]):
-            return self._generate_creation_response(message, workspace_info)
-
-        elif any(word in message for word in ["fix", "debug", "error", "bug"]):
-            return self._generate_fix_response(files, message)
-
-        elif any(word in message for word in ["test", "testing", "unittest"]):
-            return self._generate_test_response(files, workspace_info)
-
-        elif any(word in message for word in ["refactor", "improve", "optimize"]):
-            return self._generate_refactor_response(files, message)
-
-        else:
-            return self._generate_general_response(message, context)
-
     def _generate_greeting_response(
         self, context: Dict[str, Any], model_name: str = "CLI Pilot"
     ) -> Dict[str, Any]:
@@ -750,26 +1192,16 @@ For your coding needs, I can provide in-depth analysis, algorithm design, debugg
             .get("type", "unknown")
         )
 
-        content = f"""Hello! I'm {model_name}, your GitHub Copilot assistant.
-
-I can see you're working in: {workspace_path}"""
-
+        parts = [
+            f"Hello! I'm {model_name}, your GitHub Copilot assistant.\n\n"
+            f"I can see you're working in: {workspace_path}"
+        ]
         if project_type != "unknown":
-            content += f"\nProject type detected: {project_type}"
+            parts.append(f"\nProject type detected: {project_type}")
+        parts.append(_GREETING_CAPABILITIES)
+        content = "".join(parts)
 
-        content += """
-
-I can help you with:
-• Code explanation and documentation
-• Creating new functions and classes
-• Debugging and fixing issues
-• Writing tests
-• Code refactoring and optimization
-• General programming questions
-
-What would you like to work on today?"""
-
-        return {"content": content, "references": []}
+        return {"content": content, "references": _EMPTY_REFS}
 
     def _generate_explanation_response(
         self, files: List[Dict[str, Any]], message: str, model_name: str = "CLI Pilot"
@@ -788,7 +1220,8 @@ What specific code would you like me to explain?"""
             file_content = file.get("content", "")
             file_path = file.get("path", "unknown")
             file_size = file.get("size", 0)
-            lines = len(file_content.split("\n"))
+            # Same as len(split("\n")) without building the list of lines
+            lines = file_content.count("\n") + 1
             
             # Detect language from file extension
             language = self._detect_language(file_path)
@@ -896,7 +1329,7 @@ Please be more specific about what you'd like to create. For example:
 "Create a Python function that reads a CSV file"
 "Create a React component for a login form" """
 
-        return {"content": content, "references": []}
+        return {"content": content, "references": _EMPTY_REFS}
 
     def _generate_fix_response(
         self, files: List[Dict[str, Any]], message: str, model_name: str = "CLI Pilot"
@@ -924,7 +1357,12 @@ What specific issue are you encountering?"""
             language = self._detect_language(file_path)
             
             # Analyze the file for potential issues
-            issues = self._detect_potential_issues(file_content, language, file_path)
+            # Split once; the line list is shared with the issue detectors
+            lines = file_content.split("\n")
+            line_count = len(lines)
+            issues = self._detect_potential_issues(
+                file_content, language, file_path, lines=lines
+            )
 
             content = f"""🔧 **Debugging Analysis for `{file_path}`**
 
@@ -932,7 +1370,7 @@ What specific issue are you encountering?"""
 • File: {file_path}
 • Language: {language.title()}
 • Size: {file.get('size', 0)} bytes
-• Lines: {len(file_content.split('\n'))}
+• Lines: {line_count}
 
 **🔍 Potential Issues Detected:**
 {issues['syntax_issues']}
@@ -955,92 +1393,129 @@ What specific error message or behavior are you experiencing? I can provide more
 
         return {"content": content, "references": [f.get("path") for f in files]}
 
-    def _detect_potential_issues(self, content: str, language: str, file_path: str) -> Dict[str, str]:
-        """Detect potential issues in code files."""
-        if language == 'python':
-            return self._detect_python_issues(content, file_path)
-        elif language in ['javascript', 'typescript']:
-            return self._detect_javascript_issues(content, file_path)
-        elif language == 'json':
-            return self._detect_json_issues(content, file_path)
+    def _detect_potential_issues(
+        self, content: str, language: str, file_path: str, lines: Optional[List[str]] = None
+    ) -> Dict[str, str]:
+        """Detect potential issues in code files.
+
+        Args:
+            content: File content
+            language: Detected language
+            file_path: Path of the file, for messages
+            lines: Content already split on newlines, if the caller has it;
+                only the JavaScript checks walk lines
+        """
+        # Reports only depend on these, so asking about an unchanged file
+        # again skips the scans
+        key = ('issues', file_path, language, _content_key(content))
+        cached = self._get_cached_analysis(key)
+        if cached is not None:
+            return cached
+
+        detector = self._ISSUE_DETECTORS.get(language)
+        if detector is not None:
+            issues = getattr(self, detector)(content, file_path, lines)
         else:
-            return {
+            issues = {
                 'syntax_issues': f"• No automated {language} syntax checking available",
                 'quality_issues': "• Manual review recommended",
                 'suggestions': "• Use language-specific linting tools",
                 'language_specific': f"• Check {language} documentation for best practices"
             }
+        return self._cache_analysis(key, issues)
 
-    def _detect_python_issues(self, content: str, file_path: str) -> Dict[str, str]:
-        """Detect potential issues in Python code."""
-        import re
-        
-        issues = []
-        quality_issues = []
+    def _detect_python_issues(
+        self, content: str, file_path: str, lines: Optional[List[str]] = None
+    ) -> Dict[str, str]:
+        """Detect potential issues in Python code.
+
+        ``lines`` is accepted for the common detector signature; the checks
+        scan ``content`` directly.
+        """
         suggestions = []
         
-        lines = content.split('\n')
+        # Every per-line check is a MULTILINE regex scanned over the whole
+        # file, so no line list is built. Entries are (line, order within
+        # line, message) and get merged back into per-line order. Matches
+        # come in line order, so each scan can stop once it alone has more
+        # entries than the rendered list keeps.
+        line_issues = []
+        line_quality = []
         
-        # Check for common Python issues
-        for i, line in enumerate(lines, 1):
-            # Indentation issues (mixing tabs and spaces)
-            if '\t' in line and '    ' in line:
-                issues.append(f"Line {i}: Mixed tabs and spaces")
-                
-            # Long lines (>100 characters)
-            if len(line) > 100:
-                quality_issues.append(f"Line {i}: Long line ({len(line)} chars) - consider breaking")
-                
-            # Bare except clauses
-            if re.match(r'^\s*except\s*:', line):
-                issues.append(f"Line {i}: Bare except clause - specify exception type")
-                
-            # Print statements (might be debug code)
-            if re.match(r'^\s*print\s*\(', line):
-                quality_issues.append(f"Line {i}: Print statement found - remove if not needed")
+        # Indentation issues (mixing tabs and spaces)
+        for i, _ in islice(_iter_line_matches(_RE_MIXED_INDENT, content), _MAX_ISSUES + 1):
+            line_issues.append((i, 0, f"Line {i}: Mixed tabs and spaces"))
+            
+        # Long lines (>100 characters)
+        for i, match in islice(_iter_line_matches(_RE_LONG_LINE, content), _MAX_ISSUES + 1):
+            length = match.end() - match.start()
+            line_quality.append((i, 0, f"Line {i}: Long line ({length} chars) - consider breaking"))
+        
+        # Bare except clauses and print statements in a single scan
+        bare_excepts = prints = 0
+        for i, match in _iter_line_matches(_RE_PY_LINE_ISSUES, content):
+            if match.lastgroup == 'bare_except':
+                if bare_excepts <= _MAX_ISSUES:
+                    line_issues.append((i, 1, f"Line {i}: Bare except clause - specify exception type"))
+                bare_excepts += 1
+            else:
+                # Print statements (might be debug code)
+                if prints <= _MAX_ISSUES:
+                    line_quality.append((i, 1, f"Line {i}: Print statement found - remove if not needed"))
+                prints += 1
+            if bare_excepts > _MAX_ISSUES and prints > _MAX_ISSUES:
+                break
+        
+        # File-level findings go ahead of the per-line ones so a long run of
+        # line issues cannot push them past the truncation marker
+        issues = []
+        quality_issues = []
         
         # Check for missing imports
-        if 'json.' in content and 'import json' not in content:
-            issues.append("Missing import: 'import json' required")
-            
-        if 'os.' in content and 'import os' not in content:
-            issues.append("Missing import: 'import os' required")
-            
-        if 're.' in content and 'import re' not in content:
-            issues.append("Missing import: 'import re' required")
+        found = set()
+        for match in _RE_PY_IMPORT_NEEDLES.finditer(content):
+            found.add(match.group(1))
+            if len(found) == len(_PY_IMPORT_NEEDLES):
+                break
+        for module in ('json', 'os', 're'):
+            if f'{module}.' in found and f'import {module}' not in found:
+                issues.append(f"Missing import: 'import {module}' required")
         
         # Check for potential logic issues
-        if_without_else = len(re.findall(r'\bif\s+.*:', content)) - len(re.findall(r'\belse\s*:', content))
+        if_without_else = len(_RE_IF_BLOCK.findall(content)) - len(_RE_ELSE.findall(content))
         if if_without_else > 3:
             quality_issues.append(f"{if_without_else} if statements without else - check edge cases")
         
+        issues.extend(message for _, _, message in sorted(line_issues))
+        quality_issues.extend(message for _, _, message in sorted(line_quality))
+        
         # Functions without docstrings
-        functions = re.findall(r'^\s*def\s+(\w+)', content, re.MULTILINE)
-        docstrings = len(re.findall(r'""".*?"""', content, re.DOTALL))
+        functions, docstrings = self._python_outline(content)
         if len(functions) > docstrings:
             suggestions.append(f"Add docstrings to {len(functions) - docstrings} functions")
         
         return {
-            'syntax_issues': '\n'.join([f"• {issue}" for issue in issues]) or "• No obvious syntax issues detected",
-            'quality_issues': '\n'.join([f"• {issue}" for issue in quality_issues]) or "• Code quality looks reasonable",
-            'suggestions': '\n'.join([f"• {suggestion}" for suggestion in suggestions]) or "• Code structure appears good",
+            'syntax_issues': _bullet_list(issues, _NO_SYNTAX_ISSUES),
+            'quality_issues': _bullet_list(quality_issues, _NO_QUALITY_ISSUES),
+            'suggestions': _bullet_list(suggestions, "• Code structure appears good"),
             'language_specific': "• Check indentation consistency\n• Verify all imports are present\n• Test exception handling\n• Run with python -m py_compile to check syntax"
         }
 
-    def _detect_javascript_issues(self, content: str, file_path: str) -> Dict[str, str]:
+    def _detect_javascript_issues(
+        self, content: str, file_path: str, lines: Optional[List[str]] = None
+    ) -> Dict[str, str]:
         """Detect potential issues in JavaScript code."""
-        import re
-        
         issues = []
         quality_issues = []
         suggestions = []
         
-        lines = content.split('\n')
+        if lines is None:
+            lines = _iter_lines(content)
         
         # Check for common JavaScript issues
         for i, line in enumerate(lines, 1):
             # Missing semicolons (basic check)
-            if re.match(r'^\s*(var|let|const|function|return)', line) and not line.rstrip().endswith((';', '{', '}')):
+            if line.lstrip().startswith(_JS_STATEMENT_PREFIXES) and not line.rstrip().endswith((';', '{', '}')):
                 quality_issues.append(f"Line {i}: Consider adding semicolon")
                 
             # == instead of === (loose equality)
@@ -1050,35 +1525,49 @@ What specific error message or behavior are you experiencing? I can provide more
             # Console.log statements
             if 'console.log' in line:
                 quality_issues.append(f"Line {i}: Console.log found - remove if not needed")
+            
+            # Both lists already overflow what gets rendered
+            if len(issues) > _MAX_ISSUES and len(quality_issues) > _MAX_ISSUES:
+                break
         
         # Check for undefined variables (basic check)
-        var_declarations = re.findall(r'\b(var|let|const)\s+(\w+)', content)
+        var_declarations = _RE_JS_VAR.findall(content)
         declared_vars = set(var[1] for var in var_declarations)
         
         # Function declarations
-        function_names = re.findall(r'function\s+(\w+)', content)
+        function_names = _RE_JS_FN.findall(content)
         declared_vars.update(function_names)
         
         # Check for potential undefined usage (very basic)
-        used_vars = re.findall(r'\b(\w+)\s*\(', content)  # Function calls
-        undefined_potential = set(used_vars) - declared_vars - {'console', 'document', 'window', 'require', 'module', 'exports'}
+        used_vars = {match.group(1) for match in _RE_JS_CALL.finditer(content)}  # Function calls
+        undefined_potential = used_vars - _JS_KNOWN_CALLABLES - declared_vars
         
-        if undefined_potential:
-            for var in list(undefined_potential)[:3]:  # Limit to 3 examples
-                issues.append(f"Potential undefined variable: '{var}'")
+        # Listed ahead of the per-line issues so truncation cannot hide them
+        issues[:0] = [
+            f"Potential undefined variable: '{var}'"
+            for var in islice(undefined_potential, 3)  # Limit to 3 examples
+        ]
         
         return {
-            'syntax_issues': '\n'.join([f"• {issue}" for issue in issues]) or "• No obvious syntax issues detected",
-            'quality_issues': '\n'.join([f"• {issue}" for issue in quality_issues]) or "• Code quality looks reasonable",
-            'suggestions': '\n'.join([f"• {suggestion}" for suggestion in suggestions]) or "• Consider using a linter like ESLint",
+            'syntax_issues': _bullet_list(issues, _NO_SYNTAX_ISSUES),
+            'quality_issues': _bullet_list(quality_issues, _NO_QUALITY_ISSUES),
+            'suggestions': _bullet_list(suggestions, "• Consider using a linter like ESLint"),
             'language_specific': "• Check for missing semicolons\n• Use strict equality (===)\n• Verify variable declarations\n• Test in browser console for runtime errors"
         }
 
-    def _detect_json_issues(self, content: str, file_path: str) -> Dict[str, str]:
-        """Detect potential issues in JSON files."""
+    def _detect_json_issues(
+        self, content: str, file_path: str, lines: Optional[List[str]] = None
+    ) -> Dict[str, str]:
+        """Detect potential issues in JSON files.
+
+        ``lines`` is accepted for the common detector signature and unused.
+        """
         try:
-            import json
-            json.loads(content)
+            # orjson is the fastest check when installed. Without it, large
+            # files are checked by streaming; anything the stream rejects is
+            # re-parsed so the error carries a line and column
+            if orjson is not None or not _stream_json_is_valid(content):
+                _check_json(content)
             return {
                 'syntax_issues': "• Valid JSON syntax ✓",
                 'quality_issues': "• No structural issues detected",
@@ -1102,74 +1591,32 @@ What specific error message or behavior are you experiencing? I can provide more
         """Generate a testing response."""
         project_type = workspace_info.get("project_info", {}).get("type", "unknown")
 
-        content = f"""I'll help you write tests!
+        parts = [f"""I'll help you write tests!
 
 **Project Type:** {project_type.title() if project_type != 'unknown' else 'Unknown'}
-"""
+"""]
 
         if project_type == "python":
-            content += """
-**Python Testing Options:**
-• `unittest` (built-in)
-• `pytest` (popular third-party)
-• `doctest` (for documentation examples)
-
-**Example Test Structure:**
-```python
-import unittest
-from your_module import your_function
-
-class TestYourFunction(unittest.TestCase):
-    def test_basic_functionality(self):
-        result = your_function(input_value)
-        self.assertEqual(result, expected_value)
-
-    def test_edge_cases(self):
-        # Test edge cases here
-        pass
-
-if __name__ == '__main__':
-    unittest.main()
-```"""
+            parts.append(_PY_TEST_TEMPLATE)
 
         elif project_type == "nodejs":
-            content += """
-**JavaScript Testing Options:**
-• Jest (popular choice)
-• Mocha + Chai
-• Jasmine
-
-**Example Jest Test:**
-```javascript
-const yourFunction = require('./your-module');
-
-describe('Your Function', () => {
-    test('should return expected value', () => {
-        const result = yourFunction(inputValue);
-        expect(result).toBe(expectedValue);
-    });
-
-    test('should handle edge cases', () => {
-        // Test edge cases here
-    });
-});
-```"""
+            parts.append(_JS_TEST_TEMPLATE)
 
         else:
-            content += """
+            parts.append("""
 I can help you write tests for various frameworks and languages!
 
 Please tell me:
 1. What code do you want to test?
 2. What testing framework are you using?
-3. What specific scenarios should the tests cover?"""
+3. What specific scenarios should the tests cover?""")
 
         if files:
-            content += "\n\n**Files to Test:**\n"
+            parts.append("\n\n**Files to Test:**\n")
             for file in files[:3]:  # Limit to first 3 files
-                content += f"• {file['path']} ({file.get('language', 'unknown')})\n"
+                parts.append(f"• {file['path']} ({file.get('language', 'unknown')})\n")
 
-        return {"content": content, "references": [f.get("path") for f in files]}
+        return {"content": "".join(parts), "references": [f.get("path") for f in files]}
 
     def _generate_refactor_response(
         self, files: List[Dict[str, Any]], message: str, model_name: str = "CLI Pilot"
@@ -1194,7 +1641,7 @@ What specific improvements are you looking for?"""
             file = files[0]
             language = file.get("language", "unknown")
 
-            content = f"""I'll help you refactor `{file['path']}`!
+            parts = [f"""I'll help you refactor `{file['path']}`!
 
 **Refactoring Analysis:**
 • File: {file['path']}
@@ -1202,130 +1649,109 @@ What specific improvements are you looking for?"""
 • Size: {file.get('size', 0)} bytes
 
 **Common Refactoring Opportunities:**
-"""
+"""]
 
             if language == "python":
-                content += """• Extract long functions into smaller ones
-• Use list/dict comprehensions where appropriate
-• Apply PEP 8 style guidelines
-• Remove code duplication
-• Improve variable and function names
-• Add type hints for better clarity
-• Optimize imports and dependencies"""
+                parts.append(_PY_REFACTOR_TIPS)
 
             elif language == "javascript":
-                content += """• Convert to modern ES6+ syntax
-• Extract reusable components/functions
-• Improve async/await usage
-• Optimize DOM manipulations
-• Remove unused variables and functions
-• Improve error handling
-• Apply consistent naming conventions"""
+                parts.append(_JS_REFACTOR_TIPS)
 
             else:
-                content += """
+                parts.append("""
 
 **What would you like to focus on?**
 • Performance optimization
 • Code readability
 • Better structure/organization
-• Specific code smells you've noticed"""
+• Specific code smells you've noticed""")
+
+            content = "".join(parts)
 
         return {"content": content, "references": [f.get("path") for f in files]}
 
-    def _detect_language(self, file_path: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _detect_language(file_path: str) -> str:
         """Detect programming language from file extension."""
-        extension_map = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.jsx': 'jsx',
-            '.tsx': 'tsx',
-            '.java': 'java',
-            '.c': 'c',
-            '.cpp': 'cpp',
-            '.h': 'c',
-            '.hpp': 'cpp',
-            '.cs': 'csharp',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.php': 'php',
-            '.rb': 'ruby',
-            '.swift': 'swift',
-            '.kt': 'kotlin',
-            '.html': 'html',
-            '.css': 'css',
-            '.scss': 'scss',
-            '.sass': 'sass',
-            '.json': 'json',
-            '.xml': 'xml',
-            '.yaml': 'yaml',
-            '.yml': 'yaml',
-            '.md': 'markdown',
-            '.sql': 'sql',
-            '.sh': 'bash',
-            '.bat': 'batch',
-            '.ps1': 'powershell',
-        }
-        
-        if '.' in file_path:
-            extension = '.' + file_path.split('.')[-1].lower()
-            return extension_map.get(extension, 'unknown')
-        return 'unknown'
+        _, dot, extension = file_path.rpartition('.')
+        if not dot:
+            return 'unknown'
+        return _EXTENSION_LANGUAGES.get('.' + extension.lower(), 'unknown')
 
     def _analyze_file_content(self, content: str, language: str, file_path: str) -> Dict[str, str]:
         """Analyze file content and provide structured insights."""
+        key = ('analysis', file_path, language, _content_key(content))
+        cached = self._get_cached_analysis(key)
+        if cached is not None:
+            return cached
+
         lines = content.split('\n')
-        total_lines = len(lines)
-        non_empty_lines = len([line for line in lines if line.strip()])
-        
-        analysis = {
-            'overview': '',
-            'structure': '',
-            'components': '',
-            'suggestions': ''
-        }
-        
-        if language == 'python':
-            analysis = self._analyze_python_content(content, lines, file_path)
-        elif language in ['javascript', 'typescript']:
-            analysis = self._analyze_javascript_content(content, lines, file_path)
-        elif language == 'json':
-            analysis = self._analyze_json_content(content, lines, file_path)
-        elif language == 'markdown':
-            analysis = self._analyze_markdown_content(content, lines, file_path)
+        analyzer = self._CONTENT_ANALYZERS.get(language)
+        if analyzer is not None:
+            analysis = getattr(self, analyzer)(content, lines, file_path)
         else:
+            total_lines = len(lines)
+            non_empty_lines = len([line for line in lines if line.strip()])
             analysis = {
                 'overview': f"This is a {language} file with {total_lines} total lines ({non_empty_lines} non-empty).",
                 'structure': "Generic file structure analysis not available for this language.",
                 'components': "File components detection not implemented for this language.",
                 'suggestions': "Language-specific suggestions not available."
             }
-        
-        return analysis
+
+        return self._cache_analysis(key, analysis)
+
+    def _get_cached_analysis(self, key: Tuple[str, str, str, Tuple[int, bytes]]) -> Optional[Dict[str, str]]:
+        """Return a copy of a cached report, marking it recently used."""
+        cached = self._analysis_cache.get(key)
+        if cached is None:
+            return None
+        self._analysis_cache.move_to_end(key)
+        return dict(cached)
+
+    def _cache_analysis(self, key: Tuple[str, str, str, Tuple[int, bytes]], report: Dict[str, str]) -> Dict[str, str]:
+        """Store a report, evicting the least recently used, and return a copy."""
+        self._analysis_cache[key] = report
+        if len(self._analysis_cache) > self._ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return dict(report)
+
+    def _python_outline(self, content: str) -> Tuple[Tuple[str, ...], int]:
+        """Return the function names and docstring count of Python source.
+
+        Debugging a file and explaining it both need these; the last result
+        is kept so the same content is only scanned once per turn.
+        """
+        key = _content_key(content)
+        last = self._last_python_outline
+        if last is not None and last[0] == key:
+            return last[1], last[2]
+        functions = tuple(_RE_DEF.findall(content))
+        docstrings = content.count('"""') // 2
+        self._last_python_outline = (key, functions, docstrings)
+        return functions, docstrings
 
     def _analyze_python_content(self, content: str, lines: List[str], file_path: str) -> Dict[str, str]:
         """Analyze Python file content."""
-        import re
-        
         # Count different elements
-        imports = len([line for line in lines if re.match(r'^\s*(import|from)', line.strip())])
-        functions = len(re.findall(r'^\s*def\s+(\w+)', content, re.MULTILINE))
-        classes = len(re.findall(r'^\s*class\s+(\w+)', content, re.MULTILINE))
-        comments = len([line for line in lines if line.strip().startswith('#')])
-        docstrings = len(re.findall(r'""".*?"""', content, re.DOTALL))
-        
+        imports = comments = 0
+        for line in lines:
+            stripped = line.lstrip()
+            if stripped.startswith(('import', 'from')):
+                imports += 1
+            elif stripped.startswith('#'):
+                comments += 1
         # Extract function and class names
-        function_names = re.findall(r'^\s*def\s+(\w+)', content, re.MULTILINE)
-        class_names = re.findall(r'^\s*class\s+(\w+)', content, re.MULTILINE)
+        function_names, docstrings = self._python_outline(content)
+        class_names = _RE_CLASS.findall(content)
+        functions = len(function_names)
+        classes = len(class_names)
         
         # Basic complexity analysis
-        complexity_indicators = {
-            'try_except': len(re.findall(r'\btry\s*:', content)),
-            'if_statements': len(re.findall(r'\bif\s+', content)),
-            'loops': len(re.findall(r'\b(for|while)\s+', content)),
-            'decorators': len(re.findall(r'@\w+', content))
-        }
+        complexity_indicators = dict.fromkeys(_RE_PY_COMPLEXITY.groupindex, 0)
+        for match in _RE_PY_COMPLEXITY.finditer(content):
+            complexity_indicators[match.lastgroup] += 1
         
         return {
             'overview': f"Python file with {len(lines)} lines, {imports} imports, {functions} functions, {classes} classes, {comments} comments.",
@@ -1336,14 +1762,12 @@ What specific improvements are you looking for?"""
 
     def _analyze_javascript_content(self, content: str, lines: List[str], file_path: str) -> Dict[str, str]:
         """Analyze JavaScript/TypeScript file content."""
-        import re
-        
         # Count different elements
-        imports = len(re.findall(r'^\s*(import|require)', content, re.MULTILINE))
-        functions = len(re.findall(r'(function\s+\w+|const\s+\w+\s*=\s*\(|let\s+\w+\s*=\s*\(|var\s+\w+\s*=\s*\()', content))
-        arrow_functions = len(re.findall(r'=>', content))
-        classes = len(re.findall(r'^\s*class\s+\w+', content, re.MULTILINE))
-        async_functions = len(re.findall(r'\basync\s+(function|\w+)', content))
+        imports = len(_RE_JS_IMPORT.findall(content))
+        functions = len(_RE_JS_FUNCTION.findall(content))
+        arrow_functions = content.count('=>')
+        classes = len(_RE_CLASS.findall(content))
+        async_functions = len(_RE_JS_ASYNC.findall(content))
         
         return {
             'overview': f"JavaScript file with {len(lines)} lines, {imports} imports, {functions} functions, {classes} classes.",
@@ -1352,31 +1776,51 @@ What specific improvements are you looking for?"""
             'suggestions': f"• Modern Syntax: {'Good use of ES6+' if arrow_functions > 0 else 'Consider modern syntax'}\n• Async Handling: {'Uses async/await' if async_functions > 0 else 'Check for Promise handling'}\n• Code Style: 'Review for consistency'"
         }
 
+    @staticmethod
+    def _summarize_json(data: Any) -> Tuple[str, List[str], int]:
+        """Get structure type, top-level keys and nested item count of parsed JSON."""
+        # Containers count their entries, scalars count once. An explicit
+        # stack avoids a Python call per node and the recursion limit on
+        # deeply nested documents.
+        total_items = 0
+        stack = [data]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, dict):
+                total_items += len(obj)
+                stack.extend(obj.values())
+            elif isinstance(obj, list):
+                total_items += len(obj)
+                stack.extend(obj)
+            else:
+                total_items += 1
+        
+        if isinstance(data, dict):
+            top_keys = list(data.keys())[:5]
+            structure_type = "Object"
+        elif isinstance(data, list):
+            top_keys = [f"Array[{len(data)}]"]
+            structure_type = "Array"
+        else:
+            top_keys = [str(type(data).__name__)]
+            structure_type = "Primitive"
+        return structure_type, top_keys, total_items
+
     def _analyze_json_content(self, content: str, lines: List[str], file_path: str) -> Dict[str, str]:
         """Analyze JSON file content."""
+        summary = None
+        if _can_stream_json(content):
+            try:
+                summary = _stream_json_summary(content)
+            except Exception:
+                # Invalid or undecodable; json.loads below reports the error
+                summary = None
+
         try:
-            import json
-            data = json.loads(content)
-            
-            def count_nested_items(obj, depth=0):
-                if isinstance(obj, dict):
-                    return sum(count_nested_items(v, depth+1) for v in obj.values()) + len(obj)
-                elif isinstance(obj, list):
-                    return sum(count_nested_items(item, depth+1) for item in obj) + len(obj)
-                else:
-                    return 1
-            
-            total_items = count_nested_items(data)
-            
-            if isinstance(data, dict):
-                top_keys = list(data.keys())[:5]
-                structure_type = "Object"
-            elif isinstance(data, list):
-                top_keys = [f"Array[{len(data)}]"]
-                structure_type = "Array"
+            if summary is not None:
+                structure_type, top_keys, total_items = summary
             else:
-                top_keys = [str(type(data).__name__)]
-                structure_type = "Primitive"
+                structure_type, top_keys, total_items = self._summarize_json(json.loads(content))
                 
             return {
                 'overview': f"Valid JSON {structure_type.lower()} with {total_items} total items across all nesting levels.",
@@ -1394,16 +1838,14 @@ What specific improvements are you looking for?"""
 
     def _analyze_markdown_content(self, content: str, lines: List[str], file_path: str) -> Dict[str, str]:
         """Analyze Markdown file content."""
-        import re
-        
-        headers = len(re.findall(r'^#+\s+', content, re.MULTILINE))
-        code_blocks = len(re.findall(r'```', content)) // 2
-        links = len(re.findall(r'\[.*?\]\(.*?\)', content))
-        images = len(re.findall(r'!\[.*?\]\(.*?\)', content))
-        lists = len(re.findall(r'^\s*[-*+]\s+', content, re.MULTILINE))
+        headers = len(_RE_MD_HEADER.findall(content))
+        code_blocks = content.count('```') // 2
+        links = len(_RE_MD_LINK.findall(content))
+        images = len(_RE_MD_IMAGE.findall(content))
+        lists = len(_RE_MD_LIST.findall(content))
         
         # Extract header hierarchy
-        header_matches = re.findall(r'^(#+)\s+(.*)', content, re.MULTILINE)
+        header_matches = _RE_MD_HEADER_LEVEL.findall(content)
         header_levels = [len(match[0]) for match in header_matches]
         
         return {
@@ -1443,7 +1885,7 @@ I can assist you with:
 
 How can I help you with your code today?"""
 
-        return {"content": content, "references": []}
+        return {"content": content, "references": _EMPTY_REFS}
 
     def get_session_history(self) -> List[Dict[str, Any]]:
         """Get the current session history.
@@ -1451,7 +1893,7 @@ How can I help you with your code today?"""
         Returns:
             List of session messages
         """
-        return self.session_history.copy()
+        return list(self.session_history)
 
     def clear_session_history(self):
         """Clear the session history."""
@@ -7,15 +7,11 @@ Run GitHub Copilot Chat functionality without VSCode.
 import argparse
 import sys
 
-from .cli_core import CLIPilot
+_VERSION_STRING = "VSCodey Copilot 1.0.0"
 
+_DESCRIPTION = "VSCodey Copilot - Run GitHub Copilot Chat without VSCode"
 
-def main():
-    """Main entry point for VSCodey Copilot CLI."""
-    parser = argparse.ArgumentParser(
-        description="VSCodey Copilot - Run GitHub Copilot Chat without VSCode",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_EPILOG = """
 Examples:
   vscodey-copilot auth login                           # Login with GitHub OAuth
   vscodey-copilot auth status                          # Check authentication status
@@ -37,23 +33,11 @@ Examples:
 Python Module Usage:
   python -m vscodey.copilot chat "Hello world"
   python -m vscodey.copilot interactive
-        """,
-    )
+        """
 
-    parser.add_argument("--version", action="version", version="VSCodey Copilot 1.0.0")
-    parser.add_argument("--config", help="Path to configuration file")
-    parser.add_argument(
-        "--workspace",
-        help="Workspace directory (default: current directory)",
-        default=".",
-    )
-    parser.add_argument(
-        "--verbose", "-v", action="store_true", help="Enable verbose output"
-    )
-
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
-    # Authentication command
+def _add_auth_parser(subparsers):
+    """Add the `auth` command and its login/status/logout subcommands."""
     auth_parser = subparsers.add_parser("auth", help="GitHub authentication management")
     auth_subparsers = auth_parser.add_subparsers(
         dest="auth_command", help="Authentication commands"
@@ -72,8 +56,11 @@ Python Module Usage:
     auth_subparsers.add_parser(
         "logout", help="Remove stored authentication"
     )
+    return auth_parser
 
-    # Chat command
+
+def _add_chat_parser(subparsers):
+    """Add the `chat` command."""
     chat_parser = subparsers.add_parser("chat", help="Send a chat message to Copilot")
     chat_parser.add_argument("message", help="The message to send to Copilot")
     chat_parser.add_argument(
@@ -88,31 +75,49 @@ Python Module Usage:
     chat_parser.add_argument(
         "--model", "-m", help="Specific model to use (e.g., claude-3.5-sonnet, o1-mini)"
     )
+    return chat_parser
+
 
-    # Interactive command
+def _add_interactive_parser(subparsers):
+    """Add the `interactive` command."""
     interactive_parser = subparsers.add_parser(
         "interactive", help="Start interactive chat session"
     )
     interactive_parser.add_argument("--agent", help="Specific agent to use")
     interactive_parser.add_argument("--model", "-m", help="Specific model to use")
+    return interactive_parser
+
 
-    # Model management commands
-    subparsers.add_parser(
+def _add_list_models_parser(subparsers):
+    """Add the `list-models` command."""
+    return subparsers.add_parser(
         "list-models", help="List available models"
     )
 
+
+def _add_set_model_parser(subparsers):
+    """Add the `set-model` command."""
     set_model_parser = subparsers.add_parser("set-model", help="Set default model")
     set_model_parser.add_argument("model_id", help="Model ID to set as default")
+    return set_model_parser
+
 
-    # Agent management commands
-    subparsers.add_parser(
+def _add_list_agents_parser(subparsers):
+    """Add the `list-agents` command."""
+    return subparsers.add_parser(
         "list-agents", help="List available agents"
     )
 
+
+def _add_set_agent_parser(subparsers):
+    """Add the `set-agent` command."""
     set_agent_parser = subparsers.add_parser("set-agent", help="Set default agent")
     set_agent_parser.add_argument("agent_id", help="Agent ID to set as default")
+    return set_agent_parser
 
-    # MCP management commands
+
+def _add_mcp_parser(subparsers):
+    """Add the `mcp` command and its list/enable/disable subcommands."""
     mcp_parser = subparsers.add_parser(
         "mcp", help="Manage MCP (Model Context Protocol) servers"
     )
@@ -130,12 +135,100 @@ Python Module Usage:
         "disable", help="Disable an MCP server"
     )
     mcp_disable_parser.add_argument("server_id", help="MCP server ID to disable")
+    return mcp_parser
+
 
-    # Setup command (for manual token setup)
+def _add_setup_parser(subparsers):
+    """Add the `setup` command (for manual token setup)."""
     setup_parser = subparsers.add_parser(
         "setup", help="Setup VSCodey Copilot configuration manually"
     )
     setup_parser.add_argument("--token", help="GitHub Copilot token")
+    return setup_parser
+
+
+# Subcommand name -> builder, in the order they are listed in --help
+_SUBCOMMAND_BUILDERS = {
+    "auth": _add_auth_parser,
+    "chat": _add_chat_parser,
+    "interactive": _add_interactive_parser,
+    "list-models": _add_list_models_parser,
+    "set-model": _add_set_model_parser,
+    "list-agents": _add_list_agents_parser,
+    "set-agent": _add_set_agent_parser,
+    "mcp": _add_mcp_parser,
+    "setup": _add_setup_parser,
+}
+
+# Global options that consume the following argument
+_GLOBAL_OPTIONS_WITH_VALUE = ("--config", "--workspace")
+
+
+def _sniff_subcommand(argv):
+    """Return the subcommand named in argv, or None if there isn't a known one.
+
+    Global options before the subcommand are skipped. Anything argparse
+    should report on (help, unknown words) returns None so the full parser
+    is built.
+    """
+    args = iter(argv)
+    for arg in args:
+        if arg in _GLOBAL_OPTIONS_WITH_VALUE:
+            next(args, None)
+        elif arg in ("-h", "--help"):
+            return None
+        elif not arg.startswith("-"):
+            return arg if arg in _SUBCOMMAND_BUILDERS else None
+    return None
+
+
+def _build_parser(command=None):
+    """Build the argument parser.
+
+    Only the subparser for ``command`` is added when it is given; otherwise
+    all of them are, for help output and error messages.
+
+    Returns:
+        The parser and a dict of the subparsers that were added
+    """
+    parser = argparse.ArgumentParser(
+        description=_DESCRIPTION,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
+    )
+
+    parser.add_argument("--version", action="version", version=_VERSION_STRING)
+    parser.add_argument("--config", help="Path to configuration file")
+    parser.add_argument(
+        "--workspace",
+        help="Workspace directory (default: current directory)",
+        default=".",
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Enable verbose output"
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    if command is not None:
+        builders = {command: _SUBCOMMAND_BUILDERS[command]}
+        # Keep usage lines in error messages listing every command
+        subparsers.metavar = "{" + ",".join(_SUBCOMMAND_BUILDERS) + "}"
+    else:
+        builders = _SUBCOMMAND_BUILDERS
+    command_parsers = {name: build(subparsers) for name, build in builders.items()}
+    return parser, command_parsers
+
+
+def main():
+    """Main entry point for VSCodey Copilot CLI."""
+    # Version probes from scripts and CI don't need a parser at all
+    if sys.argv[1:] == ["--version"]:
+        print(_VERSION_STRING)
+        return 0
+
+    # Only the invoked subcommand's parser is built
+    parser, command_parsers = _build_parser(_sniff_subcommand(sys.argv[1:]))
 
     args = parser.parse_args()
 
@@ -143,59 +236,72 @@ Python Module Usage:
         parser.print_help()
         return 1
 
+    # Imported only once a command runs; help, version and usage errors
+    # never load the chat, auth and workspace modules
+    from .cli_core import CLIPilot
+
     try:
         clipilot = CLIPilot(
             workspace=args.workspace, verbose=args.verbose, config_path=args.config
         )
 
-        if args.command == "auth":
-            if not args.auth_command:
-                auth_parser.print_help()
-                return 1
-
-            if args.auth_command == "login":
-                return clipilot.handle_auth_login(
-                    client_id=getattr(args, "client_id", None)
-                )
-            elif args.auth_command == "status":
-                return clipilot.handle_auth_status()
-            elif args.auth_command == "logout":
-                return clipilot.handle_auth_logout()
-
-        elif args.command == "chat":
-            return clipilot.handle_chat(
+        handlers = {
+            "chat": lambda: clipilot.handle_chat(
                 message=args.message,
                 files=args.file or [],
                 include_context=args.context,
                 agent=args.agent,
                 model=args.model,
-            )
-        elif args.command == "interactive":
-            return clipilot.start_interactive(agent=args.agent, model=args.model)
-        elif args.command == "list-models":
-            return clipilot.list_models()
-        elif args.command == "set-model":
-            return clipilot.set_model(args.model_id)
-        elif args.command == "list-agents":
-            return clipilot.list_agents()
-        elif args.command == "set-agent":
-            return clipilot.set_agent(args.agent_id)
-        elif args.command == "mcp":
-            if not args.mcp_command:
-                mcp_parser.print_help()
+            ),
+            "interactive": lambda: clipilot.start_interactive(
+                agent=args.agent, model=args.model
+            ),
+            "list-models": clipilot.list_models,
+            "set-model": lambda: clipilot.set_model(args.model_id),
+            "list-agents": clipilot.list_agents,
+            "set-agent": lambda: clipilot.set_agent(args.agent_id),
+            "setup": lambda: clipilot.setup(token=args.token),
+        }
+        # Commands with subcommands: (args attribute naming the subcommand, handlers)
+        group_handlers = {
+            "auth": (
+                "auth_command",
+                {
+                    "login": lambda: clipilot.handle_auth_login(
+                        client_id=args.client_id
+                    ),
+                    "status": clipilot.handle_auth_status,
+                    "logout": clipilot.handle_auth_logout,
+                },
+            ),
+            "mcp": (
+                "mcp_command",
+                {
+                    "list": clipilot.list_mcp_servers,
+                    "enable": lambda: clipilot.manage_mcp_server(
+                        "enable", args.server_id
+                    ),
+                    "disable": lambda: clipilot.manage_mcp_server(
+                        "disable", args.server_id
+                    ),
+                },
+            ),
+        }
+
+        if args.command in group_handlers:
+            dest, handlers = group_handlers[args.command]
+            subcommand = getattr(args, dest)
+            if not subcommand:
+                command_parsers[args.command].print_help()
                 return 1
+            # argparse only accepts the subcommands registered for the group
+            return handlers[subcommand]()
 
-            if args.mcp_command == "list":
-                return clipilot.list_mcp_servers()
-            elif args.mcp_command == "enable":
-                return clipilot.manage_mcp_server("enable", args.server_id)
-            elif args.mcp_command == "disable":
-                return clipilot.manage_mcp_server("disable", args.server_id)
-        elif args.command == "setup":
-            return clipilot.setup(token=args.token)
-        else:
+        handler = handlers.get(args.command)
+        if handler is None:
             parser.print_help()
             return 1
+        return handler()
 
     except KeyboardInterrupt:
         print("\nOperation cancelled by user.")
@@ -2,19 +2,48 @@
 Core CLI functionality for Copilot Chat without VSCode.
 """
 
-import json
-import os
-import subprocess
-import sys
-import tempfile
+import functools
+import stat
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from .chat_interface import ChatInterface
 from .config import CLIConfig
-from .context_manager import WorkspaceContextManager
-from .github_auth import GitHubAuth, perform_github_login, verify_github_token
-from .interactive_session import InteractiveSession
+
+# The chat, workspace, auth and interactive modules are imported by the
+# commands that use them, so model/agent/MCP management only loads config.
+
+
+def _cli_command(error_prefix: str):
+    """Turn exceptions escaping a CLIPilot command into a message and exit code 1.
+
+    With --verbose the traceback is printed as well.
+
+    Args:
+        error_prefix: Text printed before the exception message
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except Exception as e:
+                print(f"{error_prefix}: {e}")
+                if self.verbose:
+                    import traceback
+
+                    traceback.print_exc()
+                return 1
+
+        return wrapper
+
+    return decorator
+
+
+def _format_user(user_info: Dict[str, Any]) -> str:
+    """Format a GitHub /user response as 'Name (login)'."""
+    login = user_info.get("login", "Unknown")
+    return f"{user_info.get('name', login)} ({login})"
 
 
 class CLIPilot:
@@ -33,15 +62,48 @@ class CLIPilot:
             verbose: Enable verbose logging
             config_path: Path to configuration file
         """
-        self.workspace = Path(workspace).resolve()
+        self._workspace_arg = workspace
+        self._workspace = None
         self.verbose = verbose
         self.config = CLIConfig(config_path)
-        self.context_manager = WorkspaceContextManager(self.workspace, verbose=verbose)
-        self.chat_interface = ChatInterface(self.config, verbose=verbose)
+        self._context_manager = None
+        self._chat_interface = None
 
         if verbose:
             print(f"Initialized CLI Pilot in workspace: {self.workspace}")
 
+    @property
+    def workspace(self) -> Path:
+        """Resolved workspace directory.
+
+        Resolved on first use; auth, model, agent and MCP commands never
+        touch the workspace and skip the realpath lookups.
+        """
+        if self._workspace is None:
+            self._workspace = Path(self._workspace_arg).resolve()
+        return self._workspace
+
+    @property
+    def context_manager(self):
+        """Workspace context manager, created on first use."""
+        if self._context_manager is None:
+            from .context_manager import WorkspaceContextManager
+
+            self._context_manager = WorkspaceContextManager(
+                self.workspace, verbose=self.verbose
+            )
+        return self._context_manager
+
+    @property
+    def chat_interface(self):
+        """Chat interface, created on first use."""
+        if self._chat_interface is None:
+            from .chat_interface import ChatInterface
+
+            self._chat_interface = ChatInterface(self.config, verbose=self.verbose)
+        return self._chat_interface
+
+    @_cli_command("Authentication error")
     def handle_auth_login(self, client_id: Optional[str] = None) -> int:
         """Handle GitHub OAuth login.
 
@@ -51,117 +113,97 @@ class CLIPilot:
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            print("Starting GitHub authentication...")
+        from .github_auth import GitHubAuth
 
-            # Create GitHub auth instance
-            github_auth = GitHubAuth(client_id=client_id, verbose=self.verbose)
+        print("Starting GitHub authentication...")
 
-            # Perform authentication
-            token = github_auth.authenticate()
+        # Create GitHub auth instance
+        github_auth = GitHubAuth(client_id=client_id, verbose=self.verbose)
 
-            if token:
-                # Save token to config
-                self.config.set_token(token)
+        # Perform authentication
+        token = github_auth.authenticate()
 
-                # Get user info to display confirmation
-                user_info = github_auth.get_user_info(token)
-                if user_info:
-                    username = user_info.get("login", "Unknown")
-                    name = user_info.get("name", username)
-                    print(f"✓ Successfully authenticated as {name} ({username})")
-                else:
-                    print("✓ Authentication successful!")
+        if token:
+            # Save token to config
+            self.config.set_token(token)
 
-                return 0
+            # Get user info to display confirmation
+            user_info = github_auth.get_user_info(token)
+            if user_info:
+                print(f"✓ Successfully authenticated as {_format_user(user_info)}")
             else:
-                print("✗ Authentication failed")
-                return 1
-
-        except Exception as e:
-            print(f"Authentication error: {e}")
-            if self.verbose:
-                import traceback
+                print("✓ Authentication successful!")
 
-                traceback.print_exc()
+            return 0
+        else:
+            print("✗ Authentication failed")
             return 1
 
+    @_cli_command("Error checking authentication status")
     def handle_auth_status(self) -> int:
         """Handle authentication status check.
 
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            token = self.config.get_token()
-
-            if not token:
-                print(
-                    "Not authenticated. Run 'python main.py auth login' to authenticate."
-                )
-                return 1
-
-            print("Checking authentication status...")
+        token = self.config.get_token()
 
-            # Verify token is still valid
-            if verify_github_token(token, verbose=self.verbose):
-                # Get user info
-                github_auth = GitHubAuth(verbose=self.verbose)
-                user_info = github_auth.get_user_info(token)
+        if not token:
+            print(
+                "Not authenticated. Run 'python main.py auth login' to authenticate."
+            )
+            return 1
 
-                if user_info:
-                    username = user_info.get("login", "Unknown")
-                    name = user_info.get("name", username)
-                    avatar_url = user_info.get("avatar_url", "")
+        from .github_auth import get_github_user
 
-                    print("✓ Authentication Status: Valid")
-                    print(f"  User: {name} ({username})")
-                    if avatar_url:
-                        print(f"  Profile: https://github.com/{username}")
-                else:
-                    print("✓ Authentication Status: Valid (unable to get user details)")
+        print("Checking authentication status...")
 
-                return 0
+        # A successful /user request both verifies the token and returns
+        # the user info
+        user_info = get_github_user(token, verbose=self.verbose)
+        if user_info is not None:
+            if user_info:
+                print("✓ Authentication Status: Valid")
+                print(f"  User: {_format_user(user_info)}")
+                if user_info.get("avatar_url"):
+                    print(f"  Profile: https://github.com/{user_info.get('login', 'Unknown')}")
             else:
-                print("✗ Authentication Status: Invalid or expired")
-                print("Run 'python main.py auth login' to re-authenticate.")
-                return 1
-
-        except Exception as e:
-            print(f"Error checking authentication status: {e}")
-            if self.verbose:
-                import traceback
+                print("✓ Authentication Status: Valid (unable to get user details)")
 
-                traceback.print_exc()
+            return 0
+        else:
+            print("✗ Authentication Status: Invalid or expired")
+            print("Run 'python main.py auth login' to re-authenticate.")
             return 1
 
+    @_cli_command("Error during logout")
     def handle_auth_logout(self) -> int:
         """Handle authentication logout (remove stored token).
 
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            token = self.config.get_token()
+        token = self.config.get_token()
 
-            if not token:
-                print("Not currently authenticated.")
-                return 0
+        if not token:
+            print("Not currently authenticated.")
+            return 0
 
-            # Remove token from config
-            self.config.set_token(None)
-            print("✓ Successfully logged out. Authentication token removed.")
+        # Remove token from config
+        self.config.set_token(None)
 
-            return 0
+        # Later checks in this process must not trust the old token, and the
+        # Copilot token exchanged for it must not outlive the login
+        from .chat_interface import CopilotTokenManager
+        from .github_auth import forget_github_user
 
-        except Exception as e:
-            print(f"Error during logout: {e}")
-            if self.verbose:
-                import traceback
+        forget_github_user(token)
+        CopilotTokenManager(verbose=self.verbose).invalidate()
+        print("✓ Successfully logged out. Authentication token removed.")
 
-                traceback.print_exc()
-            return 1
+        return 0
 
+    @_cli_command("Error processing chat message")
     def handle_chat(
         self,
         message: str,
@@ -182,35 +224,43 @@ class CLIPilot:
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            # Check authentication before processing chat
-            if not self._check_authentication():
-                return 1
-
-            if self.verbose:
-                print(f"Processing chat message: {message[:50]}...")
-
-            # Gather context
-            context = self._gather_context(files, include_context)
-
-            # Send to chat interface
-            response = self.chat_interface.send_message(
-                message=message, context=context, agent=agent, model=model
-            )
-
-            # Display response
-            self._display_response(response)
+        # Check authentication before processing chat
+        if not self._check_authentication():
+            return 1
 
-            return 0
+        if self.verbose:
+            print(f"Processing chat message: {message[:50]}...")
+
+        # Gather context
+        context = self._gather_context(files, include_context)
+
+        # Stream the reply to the terminal as it is generated
+        streamed = False
+
+        def show_chunk(text: str):
+            nonlocal streamed
+            if not streamed:
+                self._print_response_header()
+                streamed = True
+            print(text, end="", flush=True)
+
+        # Send to chat interface
+        response = self.chat_interface.send_message(
+            message=message,
+            context=context,
+            agent=agent,
+            model=model,
+            on_content=show_chunk,
+        )
+        if streamed:
+            print()
 
-        except Exception as e:
-            print(f"Error processing chat message: {e}")
-            if self.verbose:
-                import traceback
+        # Display response
+        self._display_response(response, streamed=streamed)
 
-                traceback.print_exc()
-            return 1
+        return 0
 
+    @_cli_command("Error in interactive session")
     def start_interactive(
         self, agent: Optional[str] = None, model: Optional[str] = None
     ) -> int:
@@ -223,28 +273,22 @@ class CLIPilot:
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            # Check authentication before starting interactive session
-            if not self._check_authentication():
-                return 1
-
-            session = InteractiveSession(
-                chat_interface=self.chat_interface,
-                context_manager=self.context_manager,
-                agent=agent,
-                model=model,
-                verbose=self.verbose,
-            )
-            return session.run()
+        # Check authentication before starting interactive session
+        if not self._check_authentication():
+            return 1
 
-        except Exception as e:
-            print(f"Error in interactive session: {e}")
-            if self.verbose:
-                import traceback
+        from .interactive_session import InteractiveSession
 
-                traceback.print_exc()
-            return 1
+        session = InteractiveSession(
+            chat_interface=self.chat_interface,
+            context_manager=self.context_manager,
+            agent=agent,
+            model=model,
+            verbose=self.verbose,
+        )
+        return session.run()
 
+    @_cli_command("Error during setup")
     def setup(self, token: Optional[str] = None) -> int:
         """Setup CLI Pilot configuration manually.
 
@@ -254,86 +298,70 @@ class CLIPilot:
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            print("Setting up CLI Pilot manually...")
-            print(
-                "Note: For OAuth authentication, use 'python main.py auth login' instead."
-            )
+        print("Setting up CLI Pilot manually...")
+        print(
+            "Note: For OAuth authentication, use 'python main.py auth login' instead."
+        )
 
-            if not token:
-                token = input("Enter your GitHub token: ").strip()
-
-            if not token:
-                print("Error: Token is required")
-                return 1
+        if not token:
+            token = input("Enter your GitHub token: ").strip()
 
-            # Verify token before saving
-            if verify_github_token(token, verbose=self.verbose):
-                self.config.set_token(token)
-                print("✓ Token verified and saved successfully!")
+        if not token:
+            print("Error: Token is required")
+            return 1
 
-                # Get user info to display confirmation
-                github_auth = GitHubAuth(verbose=self.verbose)
-                user_info = github_auth.get_user_info(token)
-                if user_info:
-                    username = user_info.get("login", "Unknown")
-                    name = user_info.get("name", username)
-                    print(f"✓ Authenticated as {name} ({username})")
+        from .github_auth import get_github_user
 
-                return 0
-            else:
-                print("✗ Token verification failed. Please check your token.")
-                return 1
+        # Verify token before saving; the same /user response supplies the
+        # confirmation details
+        user_info = get_github_user(token, verbose=self.verbose)
+        if user_info is not None:
+            self.config.set_token(token)
+            print("✓ Token verified and saved successfully!")
 
-        except Exception as e:
-            print(f"Error during setup: {e}")
-            if self.verbose:
-                import traceback
+            if user_info:
+                print(f"✓ Authenticated as {_format_user(user_info)}")
 
-                traceback.print_exc()
+            return 0
+        else:
+            print("✗ Token verification failed. Please check your token.")
             return 1
 
+    @_cli_command("Error listing models")
     def list_models(self) -> int:
         """List available models.
 
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            models = self.config.list_models()
-
-            print("\nAvailable Models:")
-            print("=" * 80)
-
-            for model in models:
-                status = " (default)" if model["is_default"] else ""
-                print(f"\n{model['name']}{status}")
-                print(f"  ID: {model['id']}")
-                print(f"  Family: {model['family']}")
-                print(f"  Description: {model['description']}")
-                print(f"  Max Tokens: {model['max_tokens']}")
-                print(f"  Supports Tools: {'Yes' if model['supports_tools'] else 'No'}")
-                print(
-                    f"  Supports Vision: {'Yes' if model['supports_vision'] else 'No'}"
-                )
-
-            print("\n" + "=" * 80)
-            print(f"Current default model: {self.config.get_default_model()}")
-            print("\nTo change the default model, use:")
-            print("  python main.py set-model <model-id>")
-            print("\nTo use a specific model for a chat, use:")
-            print('  python main.py chat "your message" --model <model-id>')
-
-            return 0
+        models = self.config.list_models()
+
+        # Build the listing and write it in one go rather than a print per line
+        lines = ["\nAvailable Models:", "=" * 80]
+
+        for model in models:
+            status = " (default)" if model["is_default"] else ""
+            lines.append(f"\n{model['name']}{status}")
+            lines.append(f"  ID: {model['id']}")
+            lines.append(f"  Family: {model['family']}")
+            lines.append(f"  Description: {model['description']}")
+            lines.append(f"  Max Tokens: {model['max_tokens']}")
+            lines.append(f"  Supports Tools: {'Yes' if model['supports_tools'] else 'No'}")
+            lines.append(
+                f"  Supports Vision: {'Yes' if model['supports_vision'] else 'No'}"
+            )
 
-        except Exception as e:
-            print(f"Error listing models: {e}")
-            if self.verbose:
-                import traceback
+        lines.append("\n" + "=" * 80)
+        lines.append(f"Current default model: {self.config.get_default_model()}")
+        lines.append("\nTo change the default model, use:")
+        lines.append("  python main.py set-model <model-id>")
+        lines.append("\nTo use a specific model for a chat, use:")
+        lines.append('  python main.py chat "your message" --model <model-id>')
+        print("\n".join(lines))
 
-                traceback.print_exc()
-            return 1
+        return 0
 
+    @_cli_command("Error setting model")
     def set_model(self, model_id: str) -> int:
         """Set the default model.
 
@@ -343,69 +371,53 @@ class CLIPilot:
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            # Validate model exists
-            model_info = self.config.get_model_info(model_id)
-            if not model_info:
-                available = list(self.config.get_available_models().keys())
-                print(f"Error: Unknown model '{model_id}'")
-                print(f"Available models: {', '.join(available)}")
-                print("Use 'python main.py list-models' to see detailed information")
-                return 1
-
-            # Set as default
-            self.config.set_default_model(model_id)
-            print(
-                f"✓ Default model set to: {model_info.get('name', model_id)} ({model_id})"
-            )
-
-            return 0
+        # Validate model exists
+        model_info = self.config.get_model_info(model_id)
+        if not model_info:
+            available = list(self.config.get_available_models().keys())
+            print(f"Error: Unknown model '{model_id}'")
+            print(f"Available models: {', '.join(available)}")
+            print("Use 'python main.py list-models' to see detailed information")
+            return 1
 
-        except Exception as e:
-            print(f"Error setting model: {e}")
-            if self.verbose:
-                import traceback
+        # Set as default
+        self.config.set_default_model(model_id)
+        print(
+            f"✓ Default model set to: {model_info.get('name', model_id)} ({model_id})"
+        )
 
-                traceback.print_exc()
-            return 1
+        return 0
 
+    @_cli_command("Error listing agents")
     def list_agents(self) -> int:
         """List available agents.
 
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            agents = self.config.list_agents()
-
-            print("\nAvailable Agents:")
-            print("=" * 80)
-
-            for agent in agents:
-                status = " (default)" if agent["is_default"] else ""
-                print(f"\n{agent['name']}{status}")
-                print(f"  ID: {agent['id']}")
-                print(f"  Description: {agent['description']}")
-                print(f"  Icon: {agent['icon']}")
-                print(f"  Capabilities: {', '.join(agent['capabilities'])}")
-
-            print("\n" + "=" * 80)
-            print(f"Current default agent: {self.config.get_default_agent()}")
-            print("\nTo change the default agent, use:")
-            print("  python main.py set-agent <agent-id>")
-            print("\nTo use a specific agent for a chat, use:")
-            print('  python main.py chat "your message" --agent <agent-id>')
+        agents = self.config.list_agents()
 
-            return 0
+        lines = ["\nAvailable Agents:", "=" * 80]
 
-        except Exception as e:
-            print(f"Error listing agents: {e}")
-            if self.verbose:
-                import traceback
+        for agent in agents:
+            status = " (default)" if agent["is_default"] else ""
+            lines.append(f"\n{agent['name']}{status}")
+            lines.append(f"  ID: {agent['id']}")
+            lines.append(f"  Description: {agent['description']}")
+            lines.append(f"  Icon: {agent['icon']}")
+            lines.append(f"  Capabilities: {', '.join(agent['capabilities'])}")
 
-                traceback.print_exc()
-            return 1
+        lines.append("\n" + "=" * 80)
+        lines.append(f"Current default agent: {self.config.get_default_agent()}")
+        lines.append("\nTo change the default agent, use:")
+        lines.append("  python main.py set-agent <agent-id>")
+        lines.append("\nTo use a specific agent for a chat, use:")
+        lines.append('  python main.py chat "your message" --agent <agent-id>')
+        print("\n".join(lines))
 
+        return 0
+
+    @_cli_command("Error setting agent")
     def set_agent(self, agent_id: str) -> int:
         """Set the default agent.
 
@@ -415,83 +427,67 @@ class CLIPilot:
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            # Validate agent exists
-            agent_info = self.config.get_agent_info(agent_id)
-            if not agent_info:
-                available = list(self.config.get_available_agents().keys())
-                print(f"Error: Unknown agent '{agent_id}'")
-                print(f"Available agents: {', '.join(available)}")
-                print("Use 'python main.py list-agents' to see detailed information")
-                return 1
-
-            # Set as default
-            self.config.set_default_agent(agent_id)
-            print(
-                f"✓ Default agent set to: {agent_info.get('name', agent_id)} ({agent_id})"
-            )
-
-            return 0
+        # Validate agent exists
+        agent_info = self.config.get_agent_info(agent_id)
+        if not agent_info:
+            available = list(self.config.get_available_agents().keys())
+            print(f"Error: Unknown agent '{agent_id}'")
+            print(f"Available agents: {', '.join(available)}")
+            print("Use 'python main.py list-agents' to see detailed information")
+            return 1
 
-        except Exception as e:
-            print(f"Error setting agent: {e}")
-            if self.verbose:
-                import traceback
+        # Set as default
+        self.config.set_default_agent(agent_id)
+        print(
+            f"✓ Default agent set to: {agent_info.get('name', agent_id)} ({agent_id})"
+        )
 
-                traceback.print_exc()
-            return 1
+        return 0
 
+    @_cli_command("Error listing MCP servers")
     def list_mcp_servers(self) -> int:
         """List MCP servers.
 
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            if not self.config.is_mcp_enabled():
-                print("MCP (Model Context Protocol) is disabled.")
-                print("To enable MCP, set 'mcp.enabled' to true in your configuration.")
-                return 1
-
-            servers = self.config.list_mcp_servers()
-
-            print("\nMCP Servers:")
-            print("=" * 80)
-
-            enabled_count = 0
-            for server in servers:
-                status = "✓ enabled" if server["enabled"] else "✗ disabled"
-                if server["enabled"]:
-                    enabled_count += 1
-
-                print(f"\n{server['name']} ({status})")
-                print(f"  ID: {server['id']}")
-                print(f"  Description: {server['description']}")
-                print(f"  Command: {server['command']} {' '.join(server['args'])}")
-                print(f"  Type: {server['type']}")
-                print(f"  Capabilities: {', '.join(server['capabilities'])}")
-                if server["env"]:
-                    print(f"  Environment: {', '.join(server['env'].keys())}")
-
-            print("\n" + "=" * 80)
-            print(
-                f"MCP Status: {'enabled' if self.config.is_mcp_enabled() else 'disabled'}"
-            )
-            print(f"Enabled servers: {enabled_count}/{len(servers)}")
-            print("\nTo enable/disable MCP servers, use:")
-            print("  python main.py mcp enable <server-id>")
-            print("  python main.py mcp disable <server-id>")
-
-            return 0
-
-        except Exception as e:
-            print(f"Error listing MCP servers: {e}")
-            if self.verbose:
-                import traceback
-
-                traceback.print_exc()
+        if not self.config.is_mcp_enabled():
+            print("MCP (Model Context Protocol) is disabled.")
+            print("To enable MCP, set 'mcp.enabled' to true in your configuration.")
             return 1
 
+        servers = self.config.list_mcp_servers()
+
+        lines = ["\nMCP Servers:", "=" * 80]
+
+        enabled_count = 0
+        for server in servers:
+            status = "✓ enabled" if server["enabled"] else "✗ disabled"
+            if server["enabled"]:
+                enabled_count += 1
+
+            lines.append(f"\n{server['name']} ({status})")
+            lines.append(f"  ID: {server['id']}")
+            lines.append(f"  Description: {server['description']}")
+            lines.append(f"  Command: {server['command']} {' '.join(server['args'])}")
+            lines.append(f"  Type: {server['type']}")
+            lines.append(f"  Capabilities: {', '.join(server['capabilities'])}")
+            if server["env"]:
+                lines.append(f"  Environment: {', '.join(server['env'].keys())}")
+
+        lines.append("\n" + "=" * 80)
+        lines.append(
+            f"MCP Status: {'enabled' if self.config.is_mcp_enabled() else 'disabled'}"
+        )
+        lines.append(f"Enabled servers: {enabled_count}/{len(servers)}")
+        lines.append("\nTo enable/disable MCP servers, use:")
+        lines.append("  python main.py mcp enable <server-id>")
+        lines.append("  python main.py mcp disable <server-id>")
+        print("\n".join(lines))
+
+        return 0
+
+    @_cli_command("Error managing MCP server")
     def manage_mcp_server(self, action: str, server_id: str) -> int:
         """Enable or disable an MCP server.
 
@@ -502,33 +498,24 @@ class CLIPilot:
         Returns:
             Exit code (0 for success, non-zero for error)
         """
-        try:
-            if action == "enable":
-                self.config.enable_mcp_server(server_id)
-                server_info = self.config.get_mcp_servers().get(server_id, {})
-                print(
-                    f"✓ Enabled MCP server: {server_info.get('name', server_id)} ({server_id})"
-                )
-            elif action == "disable":
-                self.config.disable_mcp_server(server_id)
-                server_info = self.config.get_mcp_servers().get(server_id, {})
-                print(
-                    f"✓ Disabled MCP server: {server_info.get('name', server_id)} ({server_id})"
-                )
-            else:
-                print(f"Error: Unknown action '{action}'. Use 'enable' or 'disable'")
-                return 1
-
-            return 0
-
-        except Exception as e:
-            print(f"Error managing MCP server: {e}")
-            if self.verbose:
-                import traceback
-
-                traceback.print_exc()
+        if action == "enable":
+            self.config.enable_mcp_server(server_id)
+            server_info = self.config.get_mcp_servers().get(server_id, {})
+            print(
+                f"✓ Enabled MCP server: {server_info.get('name', server_id)} ({server_id})"
+            )
+        elif action == "disable":
+            self.config.disable_mcp_server(server_id)
+            server_info = self.config.get_mcp_servers().get(server_id, {})
+            print(
+                f"✓ Disabled MCP server: {server_info.get('name', server_id)} ({server_id})"
+            )
+        else:
+            print(f"Error: Unknown action '{action}'. Use 'enable' or 'disable'")
             return 1
 
+        return 0
+
     def _check_authentication(self) -> bool:
         """Check if user is authenticated.
 
@@ -549,6 +536,8 @@ class CLIPilot:
         return True
 
         # Verify token is still valid
+        from .github_auth import verify_github_token
+
         if not verify_github_token(token, verbose=self.verbose):
             print("Authentication token is invalid or expired.")
             print("Please re-authenticate with: python main.py auth login")
@@ -572,19 +561,27 @@ class CLIPilot:
 
         # Add specific files
         if files:
-            for file_path in files:
+            if len(files) > 1:
+                # Reads are independent and I/O bound; results and messages
+                # still come back in argument order
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+                    futures = [
+                        executor.submit(self._read_context_file, file_path)
+                        for file_path in files
+                    ]
+            else:
+                futures = None
+
+            for index, file_path in enumerate(files):
                 try:
-                    full_path = self.workspace / file_path
-                    if full_path.exists() and full_path.is_file():
-                        with open(full_path, "r", encoding="utf-8") as f:
-                            content = f.read()
-                        context["files"].append(
-                            {
-                                "path": file_path,
-                                "content": content,
-                                "size": len(content),
-                            }
-                        )
+                    if futures is not None:
+                        file_info = futures[index].result()
+                    else:
+                        file_info = self._read_context_file(file_path)
+                    if file_info is not None:
+                        context["files"].append(file_info)
                         if self.verbose:
                             print(f"Added file to context: {file_path}")
                     else:
@@ -604,21 +601,54 @@ class CLIPilot:
 
         return context
 
-    def _display_response(self, response: Dict[str, Any]):
+    def _read_context_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Read a --file argument into a context entry.
+
+        Args:
+            file_path: Path relative to the workspace
+
+        Returns:
+            Context entry, or None if the path is not an existing file
+        """
+        from .chat_interface import read_file_preview
+
+        full_path = self.workspace / file_path
+        # One stat answers exists, is-a-file and size
+        try:
+            file_stat = full_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+        # Only the preview is sent, so don't hold whole files
+        return {
+            "path": file_path,
+            "full_path": str(full_path),
+            "preview": read_file_preview(full_path),
+            "size": file_stat.st_size,
+        }
+
+    def _print_response_header(self):
+        """Print the banner shown above a chat response."""
+        print("\n" + "=" * 60)
+        print("Copilot Response:")
+        print("=" * 60)
+
+    def _display_response(self, response: Dict[str, Any], streamed: bool = False):
         """Display the chat response.
 
         Args:
             response: Response from chat interface
+            streamed: Whether the content was already printed while streaming
         """
         if "error" in response:
             print(f"Error: {response['error']}")
             return
 
         if "content" in response:
-            print("\n" + "=" * 60)
-            print("Copilot Response:")
-            print("=" * 60)
-            print(response["content"])
+            if not streamed:
+                self._print_response_header()
+                print(response["content"])
             print("=" * 60 + "\n")
 
         if "references" in response and response["references"]:
@@ -4,9 +4,57 @@ Configuration management for CLI Pilot.
 
 import json
 import os
+import stat
 import time
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    # Optional speedup; fall back to the standard library
+    orjson = None
+
+
+# Values list_mcp_servers reports for fields a server entry leaves out
+_MCP_SERVER_DEFAULTS = MappingProxyType({
+    "description": "No description available",
+    "command": "",
+    "type": "stdio",
+    "enabled": False,
+})
+
+
+def _load_config_json(data: bytes) -> Any:
+    """Parse configuration JSON, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # The standard library also accepts NaN/Infinity and a UTF-8
+            # BOM, and reports real errors the usual way
+            pass
+    return json.loads(data)
+
+
+def _dump_config_json(data: Dict[str, Any]) -> bytes:
+    """Serialize configuration as 2-space indented UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # e.g. integers beyond 64 bits from a hand-edited file
+            pass
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+@lru_cache(maxsize=256)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """Split a dotted configuration key, memoized for the fixed set in use."""
+    return tuple(key.split("."))
 
 
 class CLIConfig:
@@ -28,6 +76,9 @@ class CLIConfig:
 
         self.config_dir = self.config_path.parent
         self._config_data = {}
+        # Nesting depth of batch() blocks and whether a save is pending
+        self._batch_depth = 0
+        self._dirty = False
 
         self._ensure_config_dir()
         self._load_config()
@@ -42,55 +93,74 @@ class CLIConfig:
 
         if self.config_path.exists():
             try:
-                with open(self.config_path, "r", encoding="utf-8") as f:
-                    loaded_config = json.load(f)
+                loaded_config = _load_config_json(self.config_path.read_bytes())
 
                 # Merge with defaults to ensure all keys exist
                 self._config_data = self._merge_config(defaults, loaded_config)
 
-                # Save the merged config to ensure it has all the latest structure
-                self._save_config()
+                # Save the merged config to ensure it has all the latest
+                # structure, but only when merging actually added something
+                if self._config_data != loaded_config:
+                    self._save_config()
 
             except (json.JSONDecodeError, IOError) as e:
                 print(f"Warning: Could not load config from {self.config_path}: {e}")
                 print("Using default configuration.")
+                # Left on disk for the user to fix; saves are atomic, so it
+                # wasn't truncated by an interrupted write
                 self._config_data = defaults
-                self._save_config()
         else:
             self._config_data = defaults
 
     def _merge_config(
         self, defaults: Dict[str, Any], loaded: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Merge loaded config with defaults, preserving existing values.
+        """Merge loaded config into defaults, preserving existing values.
+
+        ``defaults`` is updated in place rather than copied at every level;
+        callers pass a fresh default config.
 
         Args:
-            defaults: Default configuration
+            defaults: Default configuration, modified in place
             loaded: Loaded configuration
 
         Returns:
-            Merged configuration
+            Merged configuration (``defaults``)
         """
-        result = defaults.copy()
-
         for key, value in loaded.items():
-            if (
-                key in result
-                and isinstance(result[key], dict)
-                and isinstance(value, dict)
-            ):
-                result[key] = self._merge_config(result[key], value)
+            current = defaults.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                self._merge_config(current, value)
             else:
-                result[key] = value
+                defaults[key] = value
 
-        return result
+        return defaults
 
     def _save_config(self):
         """Save configuration to file."""
+        data = _dump_config_json(self._config_data)
+
+        # Write a sibling temp file and swap it in, so a crash mid-write
+        # can never leave a truncated config behind
+        tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
         try:
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(self._config_data, f, indent=2)
+            try:
+                # The file holds the token; keep any permissions the user set
+                mode = stat.S_IMODE(os.stat(self.config_path).st_mode)
+            except FileNotFoundError:
+                mode = None
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if mode is not None:
+                os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.config_path)
         except IOError as e:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
             raise Exception(f"Could not save config to {self.config_path}: {e}")
 
     def _get_default_config(self) -> Dict[str, Any]:
@@ -103,6 +173,7 @@ class CLIConfig:
                 "max_context_size": 4096,
                 "temperature": 0.1,
                 "default_model": "gpt-4o-mini",
+                "history_max": 2000,
                 "available_agents": {
                     "workspace": {
                         "name": "Workspace Agent",
@@ -277,7 +348,7 @@ class CLIConfig:
         Returns:
             Configuration value or default
         """
-        keys = key.split(".")
+        keys = _split_key(key)
         value = self._config_data
 
         for k in keys:
@@ -295,7 +366,7 @@ class CLIConfig:
             key: Configuration key (supports dot notation)
             value: Value to set
         """
-        keys = key.split(".")
+        keys = _split_key(key)
         config = self._config_data
 
         # Navigate to the parent of the target key
@@ -306,7 +377,26 @@ class CLIConfig:
 
         # Set the value
         config[keys[-1]] = value
-        self._save_config()
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self._save_config()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group several set() calls into a single save.
+
+        The file is written once when the outermost block exits, even if
+        it exits with an exception, so it always matches memory afterwards.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._dirty:
+                self._dirty = False
+                self._save_config()
 
     def get_token(self) -> Optional[str]:
         """Get authentication token.
@@ -332,10 +422,11 @@ class CLIConfig:
             # Remove token
             self.set("auth.token", None)
         else:
-            self.set("auth.token", token)
-            # Also set the token type to indicate it's a GitHub token
-            self.set("auth.token_type", "github")
-            self.set("auth.authenticated_at", time.time())
+            with self.batch():
+                self.set("auth.token", token)
+                # Also set the token type to indicate it's a GitHub token
+                self.set("auth.token_type", "github")
+                self.set("auth.authenticated_at", time.time())
 
     def get_auth_info(self) -> Dict[str, Any]:
         """Get authentication information.
@@ -386,8 +477,9 @@ class CLIConfig:
             path: Path to export file
         """
         export_path = Path(path)
-        with open(export_path, "w", encoding="utf-8") as f:
-            json.dump(self._config_data, f, indent=2)
+        data = _dump_config_json(self._config_data)
+        with open(export_path, "wb") as f:
+            f.write(data)
 
     def import_config(self, path: str):
         """Import configuration from a file.
@@ -399,10 +491,11 @@ class CLIConfig:
         if not import_path.exists():
             raise FileNotFoundError(f"Config file not found: {path}")
 
-        with open(import_path, "r", encoding="utf-8") as f:
-            imported_config = json.load(f)
+        imported_config = _load_config_json(import_path.read_bytes())
 
-        self._config_data.update(imported_config)
+        # Merge nested sections instead of replacing them, so a partial file
+        # doesn't drop keys it leaves out
+        self._merge_config(self._config_data, imported_config)
         self._save_config()
 
     def get_available_models(self) -> Dict[str, Any]:
@@ -454,6 +547,7 @@ class CLIConfig:
             List of model information dictionaries
         """
         models = self.get_available_models()
+        default_model = self.get_default_model()
         model_list = []
 
         for model_id, model_info in models.items():
@@ -467,7 +561,7 @@ class CLIConfig:
                 "max_tokens": model_info.get("max_tokens", 4096),
                 "supports_tools": model_info.get("supports_tools", False),
                 "supports_vision": model_info.get("supports_vision", False),
-                "is_default": model_id == self.get_default_model(),
+                "is_default": model_id == default_model,
             }
             model_list.append(model_data)
 
@@ -522,6 +616,7 @@ class CLIConfig:
             List of agent information dictionaries
         """
         agents = self.get_available_agents()
+        default_agent = self.get_default_agent()
         agent_list = []
 
         for agent_id, agent_info in agents.items():
@@ -533,7 +628,7 @@ class CLIConfig:
                 ),
                 "icon": agent_info.get("icon", "copilot"),
                 "capabilities": agent_info.get("capabilities", []),
-                "is_default": agent_id == self.get_default_agent(),
+                "is_default": agent_id == default_agent,
             }
             agent_list.append(agent_data)
 
@@ -576,6 +671,16 @@ class CLIConfig:
             if server_info.get("enabled", False)
         }
 
+    def iter_enabled_mcp_servers(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over enabled MCP servers without building a dict.
+
+        Returns:
+            Iterator over (server_id, server_info) pairs of enabled servers
+        """
+        for server_id, server_info in self.get_mcp_servers().items():
+            if server_info.get("enabled", False):
+                yield server_id, server_info
+
     def list_mcp_servers(self) -> List[Dict[str, Any]]:
         """List all MCP servers with their information.
 
@@ -583,25 +688,22 @@ class CLIConfig:
             List of MCP server information dictionaries
         """
         servers = self.get_mcp_servers()
-        server_list = []
 
-        for server_id, server_info in servers.items():
-            server_data = {
-                "id": server_id,
-                "name": server_info.get("name", server_id),
-                "description": server_info.get(
-                    "description", "No description available"
-                ),
-                "command": server_info.get("command", ""),
+        # Scalar defaults are merged in one step; containers are fetched
+        # individually so every entry gets its own empty list/dict. The id
+        # comes last so a stray "id" field cannot hide the real server key.
+        return [
+            {
+                **_MCP_SERVER_DEFAULTS,
+                **server_info,
                 "args": server_info.get("args", []),
-                "type": server_info.get("type", "stdio"),
-                "enabled": server_info.get("enabled", False),
                 "capabilities": server_info.get("capabilities", []),
                 "env": server_info.get("env", {}),
+                "id": server_id,
+                "name": server_info.get("name", server_id),
             }
-            server_list.append(server_data)
-
-        return server_list
+            for server_id, server_info in servers.items()
+        ]
 
     def enable_mcp_server(self, server_id: str):
         """Enable an MCP server.
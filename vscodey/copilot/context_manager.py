@@ -7,7 +7,6 @@ import subprocess
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import fnmatch
-import mimetypes
 
 
 class WorkspaceContextManager:
@@ -3,12 +3,130 @@ GitHub OAuth authentication for CLI Pilot.
 Handles device flow authentication to get GitHub tokens.
 """
 
-import json
+import signal
+import threading
 import time
 import webbrowser
-from typing import Optional, Dict, Any
+from contextlib import contextmanager
+from typing import Iterator, Optional, Dict, Any
 import requests
-from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+
+
+GITHUB_USER_URL = "https://api.github.com/user"
+
+# How long a cached /user response is trusted (seconds)
+GITHUB_USER_CACHE_TTL = 300
+
+# In-process cache of /user responses keyed by token
+_GITHUB_USER_CACHE: Dict[str, Dict[str, Any]] = {}
+_GITHUB_USER_CACHE_LOCK = threading.Lock()
+
+
+def create_github_session(user_agent: str = "CLI-Pilot/1.0") -> requests.Session:
+    """Create a pooled HTTP session for GitHub API calls.
+    
+    Args:
+        user_agent: User-Agent header sent with every request
+        
+    Returns:
+        Session that keeps connections alive between calls
+    """
+    session = requests.Session()
+    session.headers.update({
+        "Accept": "application/json",
+        "User-Agent": user_agent
+    })
+    
+    # No automatic retries: the device-flow poll already retries on its own
+    # schedule, and urllib3 would also retry its POSTs on connect errors,
+    # keeping Ctrl-C waiting
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    return session
+
+
+@contextmanager
+def cancel_on_interrupt(stop_event: threading.Event) -> Iterator[None]:
+    """Turn Ctrl-C into ``stop_event.set()`` for the duration of the block.
+    
+    The first Ctrl-C only sets the event, so waits end cleanly. A blocking
+    call that never checks the event (an HTTP request in flight) would
+    ignore it, so a second Ctrl-C raises KeyboardInterrupt as usual.
+    
+    Signal handlers can only be installed from the main thread; elsewhere
+    this is a no-op and the caller is expected to set the event itself.
+    
+    Args:
+        stop_event: Event that long-running waits should watch
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    
+    def _on_interrupt(signum, frame):
+        if stop_event.is_set():
+            raise KeyboardInterrupt
+        stop_event.set()
+    
+    previous_handler = signal.signal(signal.SIGINT, _on_interrupt)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+
+def get_github_user(
+    token: str,
+    verbose: bool = False,
+    session: Optional[requests.Session] = None
+) -> Optional[Dict[str, Any]]:
+    """Fetch the GitHub user for a token, reusing a recent cached response.
+    
+    Args:
+        token: GitHub access token
+        verbose: Enable verbose logging
+        session: Optional HTTP session to send the request on
+        
+    Returns:
+        User information or None if the token is invalid or the request failed
+    """
+    with _GITHUB_USER_CACHE_LOCK:
+        entry = _GITHUB_USER_CACHE.get(token)
+        if entry and time.time() - entry["fetched_at"] < GITHUB_USER_CACHE_TTL:
+            return entry["data"]
+    
+    headers = {"Authorization": f"token {token}"}
+    if session is None:
+        headers["User-Agent"] = "CLI-Pilot/1.0"
+    
+    try:
+        http = session or requests
+        response = http.get(GITHUB_USER_URL, headers=headers, timeout=30)
+        if response.status_code != 200:
+            return None
+        data = response.json()
+    except Exception as e:
+        if verbose:
+            print(f"Failed to get user info: {e}")
+        return None
+    
+    with _GITHUB_USER_CACHE_LOCK:
+        _GITHUB_USER_CACHE[token] = {"data": data, "fetched_at": time.time()}
+    
+    return data
+
+
+def forget_github_user(token: str) -> None:
+    """Drop a token's cached /user response, e.g. after logging out.
+    
+    Args:
+        token: GitHub access token
+    """
+    with _GITHUB_USER_CACHE_LOCK:
+        _GITHUB_USER_CACHE.pop(token, None)
 
 
 class GitHubAuth:
@@ -17,7 +135,7 @@ class GitHubAuth:
     # GitHub OAuth endpoints
     DEVICE_CODE_URL = "https://github.com/login/device/code"
     ACCESS_TOKEN_URL = "https://github.com/login/oauth/access_token"
-    USER_URL = "https://api.github.com/user"
+    USER_URL = GITHUB_USER_URL
     
     def __init__(self, client_id: str = None, verbose: bool = False):
         """Initialize GitHub authentication.
@@ -30,6 +148,12 @@ class GitHubAuth:
         # In production, you should use your own client ID
         self.client_id = client_id or "178c6fc778ccc68e1d6a"  # GitHub CLI client ID
         self.verbose = verbose
+        self.session = create_github_session("CLI-Pilot/1.0")
+        self._stop = threading.Event()
+        
+    def cancel(self):
+        """Cancel an in-progress token poll."""
+        self._stop.set()
         
     def authenticate(self) -> Optional[str]:
         """Perform device flow authentication.
@@ -48,12 +172,17 @@ class GitHubAuth:
             # Step 2: Show user code and open browser
             self._display_user_code(device_info)
             
-            # Step 3: Poll for access token
-            access_token = self._poll_for_token(device_info)
+            # Step 3: Poll for access token (Ctrl-C cancels the wait)
+            self._stop.clear()
+            with cancel_on_interrupt(self._stop):
+                access_token = self._poll_for_token(device_info)
             
             if access_token:
                 print("✓ Authentication successful!")
                 return access_token
+            elif self._stop.is_set():
+                print("✗ Authentication cancelled.")
+                return None
             else:
                 print("✗ Authentication failed or timed out.")
                 return None
@@ -76,15 +205,9 @@ class GitHubAuth:
             "scope": "read:user user:email"  # Basic scopes for user info
         }
         
-        headers = {
-            "Accept": "application/json",
-            "User-Agent": "CLI-Pilot/1.0"
-        }
-        
-        response = requests.post(
+        response = self.session.post(
             self.DEVICE_CODE_URL,
             data=data,
-            headers=headers,
             timeout=30
         )
         
@@ -140,21 +263,15 @@ class GitHubAuth:
             "grant_type": "urn:ietf:params:oauth:grant-type:device_code"
         }
         
-        headers = {
-            "Accept": "application/json",
-            "User-Agent": "CLI-Pilot/1.0"
-        }
-        
-        start_time = time.time()
+        start_time = time.monotonic()
         
-        while time.time() - start_time < expires_in:
+        while time.monotonic() - start_time < expires_in:
             if self.verbose:
                 print("Polling for token...")
             
-            response = requests.post(
+            response = self.session.post(
                 self.ACCESS_TOKEN_URL,
                 data=data,
-                headers=headers,
                 timeout=30
             )
             
@@ -165,12 +282,14 @@ class GitHubAuth:
                     return result["access_token"]
                 elif result.get("error") == "authorization_pending":
                     # Still waiting for user to authorize
-                    time.sleep(interval)
+                    if self._stop.wait(interval):
+                        return None
                     continue
                 elif result.get("error") == "slow_down":
                     # Increase polling interval
                     interval += 5
-                    time.sleep(interval)
+                    if self._stop.wait(interval):
+                        return None
                     continue
                 else:
                     print(f"Authentication error: {result.get('error_description', 'Unknown error')}")
@@ -193,18 +312,8 @@ class GitHubAuth:
         Returns:
             True if token is valid, False otherwise
         """
-        headers = {
-            "Authorization": f"token {token}",
-            "User-Agent": "CLI-Pilot/1.0"
-        }
-        
-        try:
-            response = requests.get(self.USER_URL, headers=headers, timeout=30)
-            return response.status_code == 200
-        except Exception as e:
-            if self.verbose:
-                print(f"Token verification error: {e}")
-            return False
+        user = get_github_user(token, verbose=self.verbose, session=self.session)
+        return user is not None
     
     def get_user_info(self, token: str) -> Optional[Dict[str, Any]]:
         """Get user information using the token.
@@ -215,21 +324,7 @@ class GitHubAuth:
         Returns:
             User information or None
         """
-        headers = {
-            "Authorization": f"token {token}",
-            "User-Agent": "CLI-Pilot/1.0"
-        }
-        
-        try:
-            response = requests.get(self.USER_URL, headers=headers, timeout=30)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return None
-        except Exception as e:
-            if self.verbose:
-                print(f"Failed to get user info: {e}")
-            return None
+        return get_github_user(token, verbose=self.verbose, session=self.session)
 
 
 def perform_github_login(verbose: bool = False) -> Optional[str]:
@@ -255,5 +350,6 @@ def verify_github_token(token: str, verbose: bool = False) -> bool:
     Returns:
         True if token is valid, False otherwise
     """
-    auth = GitHubAuth(verbose=verbose)
-    return auth.verify_token(token)
\ No newline at end of file
+    # Goes straight to the cached lookup; a recently verified token costs
+    # neither a request nor a new pooled session
+    return get_github_user(token, verbose=verbose) is not None
\ No newline at end of file
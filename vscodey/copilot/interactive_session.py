@@ -2,9 +2,7 @@
 Interactive session for CLI Pilot.
 """
 
-import os
-import sys
-from typing import Any, Dict, Optional
+from typing import Optional
 
 from .chat_interface import ChatInterface
 from .context_manager import WorkspaceContextManager
@@ -174,17 +172,30 @@ class InteractiveSession:
                 print(f"Warning: Could not gather workspace context: {e}")
             context = {}
 
-        # Send message to chat interface
+        streamed = False
+
+        def show_chunk(text: str):
+            nonlocal streamed
+            streamed = True
+            print(text, end="", flush=True)
+
+        # Send message to chat interface, printing the reply as it streams in
         response = self.chat_interface.send_message(
-            message=message, context=context, agent=self.agent, model=self.model
+            message=message,
+            context=context,
+            agent=self.agent,
+            model=self.model,
+            on_content=show_chunk,
         )
 
         # Display response
+        if streamed:
+            print()
         if "error" in response:
             print(f"❌ Error: {response['error']}")
         else:
-            content = response.get("content", "No response received.")
-            print(content)
+            if not streamed:
+                print(response.get("content", "No response received."))
 
             # Show references if any
             references = response.get("references", [])